@@ -0,0 +1,147 @@
+"""Concurrent in-flight submissions through the ASGI adapter.
+
+    python benchmarks/asgi_concurrency_bench.py --in-flight 2000
+
+Drives ``src.asgi:app`` directly with an in-process event loop (no server
+or sockets) on a temporary SQLite database: opens ``--in-flight`` prayer
+request submissions at once and reports how many completed, their latency
+spread and the number of threads the process needed. First checks that a
+few requests get the same status, headers and body in WSGI and ASGI mode
+(ignoring ids and timestamps).
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+os.environ.setdefault('EMAIL_QUEUE_MODE', 'process')
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'False')
+os.environ.setdefault('DEDUP_WINDOW', '0')
+
+from src.asgi import app as asgi_app
+from src.main import app as flask_app
+
+PARITY_REQUESTS = (
+    ('GET', '/api/health/live', None),
+    ('POST', '/api/prayer-request', {'request': 'Parity check', 'isAnonymous': True}),
+    ('POST', '/api/prayer-request', {'request': ''}),
+    ('POST', '/api/contact', {'name': 'x'}),
+    ('GET', '/api/prayer-requests?per_page=5&fields=request', None),
+    ('GET', '/api/nonexistent-endpoint-for-parity', None),
+)
+
+# Vary per response by design
+VOLATILE_HEADERS = {'date', 'etag'}
+VOLATILE_FIELDS = {'timestamp', 'id', 'created_at'}
+
+
+def _normalize(body):
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return body
+    if isinstance(data, dict):
+        for name in VOLATILE_FIELDS:
+            data.pop(name, None)
+    return data
+
+
+async def call(method, path, body=None):
+    """Run one request through the ASGI app; returns (status, headers, body)"""
+    payload = json.dumps(body).encode('utf-8') if body is not None else b''
+    path, _, query = path.partition('?')
+    scope = {
+        'type': 'http', 'http_version': '1.1', 'method': method, 'scheme': 'http',
+        'path': path, 'query_string': query.encode('latin-1'), 'root_path': '',
+        'headers': [
+            (b'host', b'localhost'), (b'content-type', b'application/json'),
+            (b'content-length', str(len(payload)).encode('latin-1')),
+        ],
+        'client': ('127.0.0.1', 50000), 'server': ('localhost', 80),
+    }
+    incoming = [{'type': 'http.request', 'body': payload, 'more_body': False}]
+    finished = asyncio.Event()
+    response = {'body': []}
+
+    async def receive():
+        if incoming:
+            return incoming.pop()
+        await finished.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+            response['headers'] = message['headers']
+        else:
+            response['body'].append(message.get('body', b''))
+            if not message.get('more_body'):
+                finished.set()
+
+    await asgi_app(scope, receive, send)
+    return response['status'], response['headers'], b''.join(response['body'])
+
+
+def check_parity():
+    client = flask_app.test_client()
+    for method, path, body in PARITY_REQUESTS:
+        wsgi = client.open(path, method=method, json=body)
+        status, headers, data = asyncio.run(call(method, path, body))
+        wsgi_headers = sorted((k.lower(), v) for k, v in wsgi.headers.items() if k.lower() not in VOLATILE_HEADERS)
+        asgi_headers = sorted(
+            (k.decode(), v.decode()) for k, v in headers if k.decode() not in VOLATILE_HEADERS
+        )
+        wsgi_body, asgi_body = _normalize(wsgi.data), _normalize(data)
+        same = wsgi.status_code == status and wsgi_headers == asgi_headers and wsgi_body == asgi_body
+        print(f"{'ok  ' if same else 'DIFF'} {method} {path} -> {status}")
+        if not same:
+            print(f'  wsgi {wsgi.status_code} {wsgi_headers} {str(wsgi_body)[:200]}')
+            print(f'  asgi {status} {asgi_headers} {str(asgi_body)[:200]}')
+            return False
+    return True
+
+
+async def flood(in_flight):
+    async def one(i):
+        start = time.perf_counter()
+        status, _, _ = await call('POST', '/api/prayer-request', {
+            'request': f'Concurrent request {i}', 'name': f'Tester {i}', 'email': f't{i}@example.com'
+        })
+        return status, time.perf_counter() - start
+
+    peak_threads = threading.active_count()
+    tasks = [asyncio.create_task(one(i)) for i in range(in_flight)]
+    start = time.perf_counter()
+    while not all(task.done() for task in tasks):
+        peak_threads = max(peak_threads, threading.active_count())
+        await asyncio.sleep(0.05)
+    wall = time.perf_counter() - start
+    return [task.result() for task in tasks], wall, peak_threads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--in-flight', type=int, default=2000)
+    args = parser.parse_args()
+
+    if not check_parity():
+        sys.exit(1)
+
+    results, wall, peak_threads = asyncio.run(flood(args.in_flight))
+    latencies = sorted(elapsed * 1000 for _, elapsed in results)
+    created = sum(1 for status, _ in results if status == 201)
+    print(f'{args.in_flight} in flight: {created} created in {wall:.2f}s ({created / wall:.0f}/s), '
+          f"{flask_app.config['ASGI_THREADS']} handler threads, {peak_threads} threads peak")
+    print(f'latency p50 {latencies[len(latencies) // 2]:.0f} ms, '
+          f'p95 {latencies[int(len(latencies) * 0.95) - 1]:.0f} ms, max {latencies[-1]:.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Cold-start latency of the Netlify function ``handler``.
+
+    python benchmarks/cold_start_bench.py --runs 5
+
+Each run starts a fresh interpreter (as a cold serverless container would)
+against a throwaway copy of an already-migrated database and reports:
+
+  * import time of ``netlify_functions/main.py`` from ``python -X importtime``
+  * time from interpreter start to the first ``/api/health`` response
+    returned by ``handler``, and to the first database-backed response
+
+Requires ``serverless-wsgi`` (installed in the Netlify function bundle).
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FUNCTION_DIR = os.path.join(BACKEND, 'netlify_functions')
+
+FIRST_RESPONSE = r'''
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {function_dir!r})
+from main import handler
+imported = time.perf_counter()
+
+def event(path):
+    return {{'httpMethod': 'GET', 'path': path, 'headers': {{}}, 'queryStringParameters': None,
+             'body': None, 'isBase64Encoded': False}}
+
+health = handler(event('/api/health'), None)
+first = time.perf_counter()
+listing = handler(event('/api/prayer-requests'), None)
+db_first = time.perf_counter()
+assert health['statusCode'] == 200 and listing['statusCode'] == 200, (health, listing)
+print(json.dumps({{'import': imported - start, 'first': first - start, 'first_db': db_first - start}}))
+'''
+
+
+def import_time(env):
+    """Cumulative microseconds for importing the function module"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main'],
+        cwd=FUNCTION_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    for line in reversed(result.stderr.splitlines()):
+        parts = [part.strip() for part in line.split('|')]
+        if len(parts) == 3 and parts[2] == 'main':
+            return int(parts[1]) / 1e6
+    raise RuntimeError('main not found in -X importtime output')
+
+
+def first_response(env):
+    result = subprocess.run(
+        [sys.executable, '-c', FIRST_RESPONSE.format(function_dir=FUNCTION_DIR)],
+        cwd=FUNCTION_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    samples = {'importtime': [], 'import': [], 'first': [], 'first_db': []}
+    with tempfile.TemporaryDirectory() as template_dir:
+        # Migrate once up front: deployed databases are already current
+        template = os.path.join(template_dir, 'app.db')
+        shutil.copy(os.path.join(BACKEND, 'src', 'database', 'app.db'), template)
+        subprocess.run(
+            [sys.executable, '-m', 'flask', '--app', 'src.main', 'db', 'upgrade'],
+            cwd=BACKEND, env=dict(os.environ, DATABASE_URL=f'sqlite:///{template}'),
+            capture_output=True, check=True
+        )
+        for _ in range(args.runs):
+            with tempfile.TemporaryDirectory() as tmp:
+                db_path = os.path.join(tmp, 'app.db')
+                shutil.copy(template, db_path)
+                env = dict(os.environ, DATABASE_URL=f'sqlite:///{db_path}', EMAIL_QUEUE_MODE='process')
+                samples['importtime'].append(import_time(env))
+                for key, value in first_response(env).items():
+                    samples[key].append(value)
+
+    labels = {
+        'importtime': 'import (-X importtime)',
+        'import': 'import (wall clock)',
+        'first': 'first response /api/health',
+        'first_db': 'first DB-backed response',
+    }
+    for key, label in labels.items():
+        values = samples[key]
+        print(f'{label:28}: median {statistics.median(values) * 1000:7.1f} ms  '
+              f'(min {min(values) * 1000:.1f}, max {max(values) * 1000:.1f})')
+
+
+if __name__ == '__main__':
+    main()
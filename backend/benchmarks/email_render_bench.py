@@ -0,0 +1,67 @@
+"""Renders/sec for the email templates: per-call compile vs shared environment.
+
+    python benchmarks/email_render_bench.py --renders 2000
+
+"before" builds a ``jinja2.Template`` from source on every render, as
+EmailService used to; "after" goes through the precompiled environment.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jinja2 import Template
+from src.services import email_templates
+
+PRAYER = SimpleNamespace(
+    name='Jane Doe', email='jane@example.com', request='Please pray for my family. ' * 20,
+    category='family', is_anonymous=False, language='en', created_at=datetime.utcnow()
+)
+CONTACT = SimpleNamespace(
+    name='John Doe', email='john@example.com', subject='Hello', message='A question. ' * 20,
+    language='ar', created_at=datetime.utcnow()
+)
+CONTEXTS = {
+    'prayer_admin.html': {'prayer_request': PRAYER},
+    'prayer_confirmation.html': {'prayer_request': PRAYER},
+    'contact_admin.html': {'contact_submission': CONTACT},
+    'contact_confirmation.html': {'contact_submission': CONTACT},
+}
+
+
+def before(name):
+    return Template(email_templates.TEMPLATE_SOURCES[name]).render(datetime=datetime, **CONTEXTS[name])
+
+
+def after(name):
+    return email_templates.render(name, **CONTEXTS[name])
+
+
+def measure(render, renders):
+    names = list(CONTEXTS)
+    start = time.perf_counter()
+    for i in range(renders):
+        render(names[i % len(names)])
+    return renders / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--renders', type=int, default=2000)
+    args = parser.parse_args()
+
+    for name in CONTEXTS:
+        assert before(name) == after(name), f'{name} output differs'
+
+    before_rate = measure(before, args.renders)
+    after_rate = measure(after, args.renders)
+    print(f'before (compile per call): {before_rate:10.0f} renders/s')
+    print(f'after  (shared env)      : {after_rate:10.0f} renders/s  ({after_rate / before_rate:.0f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,294 @@
+"""Load test of the submission pipeline over real HTTP.
+
+    python benchmarks/load_test.py --concurrency 8 --requests 500
+    python benchmarks/load_test.py --compare benchmarks/results/previous.json
+
+Starts the app in a child process (threaded WSGI server) on a temporary
+SQLite database with the local SMTP sink as mail relay, then drives
+``POST /api/prayer-request``, ``POST /api/contact`` and the admin list
+endpoints from a pool of client threads. Reports p50/p95/p99 latency and
+throughput per scenario, the server's peak RSS and how long the email
+queue took to drain, and writes everything to a JSON file. ``--compare``
+prints the change against an earlier result and exits non-zero when a
+scenario regressed by more than ``--threshold`` percent.
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BACKEND)
+
+from smtp_sink import SMTPSink
+
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+
+def _prayer_body(i):
+    if i % 4 == 0:
+        return {'request': f'Load test prayer request {i}. ' * 5, 'isAnonymous': True, 'category': 'general'}
+    return {
+        'request': f'Load test prayer request {i}. ' * 5, 'name': f'Tester {i}',
+        'email': f'tester{i}@example.com', 'category': 'family', 'language': 'en'
+    }
+
+
+def _contact_body(i):
+    return {
+        'name': f'Tester {i}', 'email': f'tester{i}@example.com',
+        'subject': f'Load test {i}', 'message': f'Load test contact message {i}. ' * 5
+    }
+
+
+SCENARIOS = {
+    'prayer_request': lambda i: ('POST', '/api/prayer-request', _prayer_body(i)),
+    'contact': lambda i: ('POST', '/api/contact', _contact_body(i)),
+    'list_prayer_requests': lambda i: ('GET', f'/api/prayer-requests?page={i % 5 + 1}&per_page=20', None),
+    'list_contact_submissions': lambda i: ('GET', f'/api/contact-submissions?cursor=&per_page=20&q=load', None),
+}
+
+
+def serve(port):
+    """Child process: run the app on a threaded HTTP/1.1 server"""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    from src.main import app
+
+    class QuietHandler(WSGIRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server('127.0.0.1', port, app, threaded=True, request_handler=QuietHandler)
+    print('ready', flush=True)
+    server.serve_forever()
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _peak_rss_mb(pid):
+    """Peak resident set size of ``pid`` (Linux), or None"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+class Client:
+    """One keep-alive HTTP connection per worker thread"""
+
+    def __init__(self, port):
+        self.port = port
+        self.local = threading.local()
+
+    def request(self, method, path, body=None):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = self.local.conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=30)
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        headers = {'Content-Type': 'application/json'} if payload is not None else {}
+        start = time.perf_counter()
+        try:
+            conn.request(method, path, body=payload, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            self.local.conn = None
+            return time.perf_counter() - start, None, b''
+        return time.perf_counter() - start, response.status, data
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_scenario(client, build, requests, concurrency, offset):
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(i):
+        nonlocal errors
+        method, path, body = build(offset + i)
+        elapsed, status, _ = client.request(method, path, body)
+        with lock:
+            latencies.append(elapsed)
+            if status is None or status >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    ms = [value * 1000 for value in latencies]
+    return {
+        'requests': requests,
+        'errors': errors,
+        'throughput_rps': round(requests / wall, 1),
+        'latency_ms': {
+            'p50': round(_percentile(ms, 50), 2),
+            'p95': round(_percentile(ms, 95), 2),
+            'p99': round(_percentile(ms, 99), 2),
+            'mean': round(sum(ms) / len(ms), 2),
+            'max': round(ms[-1], 2),
+        },
+    }
+
+
+def wait_for_drain(client, timeout):
+    """Seconds until no email is pending or sending, or None on timeout"""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        _, status, data = client.request('GET', '/api/email-queue?per_page=1')
+        if status == 200:
+            counts = json.loads(data)['counts']
+            if not counts.get('pending') and not counts.get('sending'):
+                return round(time.perf_counter() - start, 2)
+        time.sleep(0.1)
+    return None
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, previous_path, threshold):
+    """Print per-scenario changes; returns True when anything regressed"""
+    with open(previous_path) as f:
+        previous = json.load(f)
+    regressed = False
+    print(f'\nvs {previous_path} ({previous["meta"].get("revision")})')
+    for name, result in current['scenarios'].items():
+        before = previous['scenarios'].get(name)
+        if not before:
+            continue
+        p95 = (result['latency_ms']['p95'] - before['latency_ms']['p95']) / before['latency_ms']['p95'] * 100
+        rps = (result['throughput_rps'] - before['throughput_rps']) / before['throughput_rps'] * 100
+        flag = ''
+        if p95 > threshold or -rps > threshold:
+            regressed = True
+            flag = '  REGRESSION'
+        print(f'{name:<26} p95 {p95:+7.1f}%   throughput {rps:+7.1f}%{flag}')
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=300, help='requests per scenario')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='comma separated subset')
+    parser.add_argument('--queue-mode', default='thread', choices=('thread', 'sync', 'process'))
+    parser.add_argument('--output', help='result file (default: benchmarks/results/load-<time>.json)')
+    parser.add_argument('--compare', help='earlier result file to compare against')
+    parser.add_argument('--threshold', type=float, default=10, help='regression threshold in percent')
+    parser.add_argument('--serve', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve)
+        return
+
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    workdir = tempfile.mkdtemp(prefix='chatat-load-')
+    port = _free_port()
+    with SMTPSink() as sink:
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'load.db')}",
+            MAIL_SERVER='127.0.0.1', MAIL_PORT=str(sink.port), MAIL_USE_TLS='False', MAIL_USE_SSL='False',
+            MAIL_DEFAULT_SENDER='load@localhost', EMAIL_QUEUE_MODE=args.queue_mode,
+            EMAIL_TEMPLATE_CACHE_DIR=os.path.join(workdir, 'templates'),
+            # Every request comes from one address with distinct content
+            RATE_LIMIT_ENABLED='False', DEDUP_WINDOW='0',
+        )
+        server = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), '--serve', str(port)],
+            cwd=BACKEND, env=env, stdout=subprocess.PIPE, text=True
+        )
+        try:
+            if server.stdout.readline().strip() != 'ready':
+                raise SystemExit('server failed to start')
+            client = Client(port)
+            # First request runs migrations; keep it out of the numbers
+            client.request('GET', '/api/prayer-requests')
+
+            results = {}
+            for index, name in enumerate(scenarios):
+                run_scenario(client, SCENARIOS[name], min(20, args.requests), args.concurrency, 10**6 * (index + 1))
+                results[name] = run_scenario(client, SCENARIOS[name], args.requests, args.concurrency, 0)
+            drain = wait_for_drain(client, 60) if args.queue_mode != 'process' else None
+            peak_rss = _peak_rss_mb(server.pid)
+        finally:
+            server.terminate()
+            server.wait(10)
+        messages = sink.messages
+
+    report = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(),
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'concurrency': args.concurrency,
+            'requests_per_scenario': args.requests,
+            'queue_mode': args.queue_mode,
+        },
+        'scenarios': results,
+        'server_peak_rss_mb': peak_rss,
+        'email_drain_seconds': drain,
+        'smtp_messages': messages,
+    }
+
+    print(f"{'scenario':<26}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for name, result in results.items():
+        latency = result['latency_ms']
+        print(f"{name:<26}{result['throughput_rps']:>9}{latency['p50']:>9}{latency['p95']:>9}"
+              f"{latency['p99']:>9}{result['errors']:>8}")
+    print(f'server peak RSS {peak_rss} MB, email drain {drain} s, {messages} messages sent')
+
+    output = args.output or os.path.join(RESULTS_DIR, f"load-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'results written to {output}')
+
+    if args.compare and compare(report, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
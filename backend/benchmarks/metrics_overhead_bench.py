@@ -0,0 +1,88 @@
+"""Request throughput with metrics disabled vs enabled.
+
+    python benchmarks/metrics_overhead_bench.py --requests 3000
+
+Runs the same request mix (health check and an uncached list page with a
+few hundred rows) through the test client of two apps on one temporary
+SQLite database, in interleaved rounds. Reports median throughput and the
+median and spread of the per-round overhead: single A/B pairs on a shared
+machine vary by more than the effect being measured.
+"""
+import argparse
+import gc
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main import create_app
+from src.models.user import db
+from src.models.forms import PrayerRequest
+
+PATHS = ('/api/health', '/api/prayer-requests?per_page=50')
+
+
+def build(path, enabled):
+    return create_app({
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}',
+        'EMAIL_QUEUE_MODE': 'process',
+        'RESPONSE_CACHE_ENABLED': False,
+        'METRICS_ENABLED': enabled,
+    })
+
+
+def measure(app, requests):
+    client = app.test_client()
+    for path in PATHS:
+        client.get(path)
+    start = time.perf_counter()
+    for i in range(requests):
+        client.get(PATHS[i % len(PATHS)])
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=3000)
+    parser.add_argument('--rounds', type=int, default=15)
+    args = parser.parse_args()
+    if args.rounds < 2:
+        parser.error('--rounds must be at least 2 to report a spread')
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    seed = build(path, False)
+    with seed.test_request_context():
+        seed.preprocess_request()
+        db.session.execute(db.insert(PrayerRequest), [
+            {'request': f'Request {i}', 'category': 'general', 'is_anonymous': True} for i in range(300)
+        ])
+        db.session.commit()
+
+    apps = {enabled: build(path, enabled) for enabled in (False, True)}
+    # Interleave, swapping the order every round, so drift (caches warming,
+    # CPU frequency, neighbours) affects both alike; compare within rounds
+    results = {False: [], True: []}
+    overheads = []
+    for round_number in range(args.rounds):
+        order = (False, True) if round_number % 2 == 0 else (True, False)
+        rates = {}
+        for enabled in order:
+            gc.collect()
+            rates[enabled] = measure(apps[enabled], args.requests)
+            results[enabled].append(rates[enabled])
+        overheads.append((rates[False] - rates[True]) / rates[False] * 100)
+
+    low, _, high = statistics.quantiles(overheads, n=4)
+    off, on = statistics.median(results[False]), statistics.median(results[True])
+    print(f'{args.rounds} interleaved rounds of {args.requests} requests, medians:')
+    print(f'metrics disabled: {off:8.0f} req/s')
+    print(f'metrics enabled : {on:8.0f} req/s')
+    print(f'overhead per round: median {statistics.median(overheads):+.2f}%, '
+          f'quartiles {low:+.2f}% .. {high:+.2f}%, range {min(overheads):+.2f}% .. {max(overheads):+.2f}%')
+
+
+if __name__ == '__main__':
+    main()
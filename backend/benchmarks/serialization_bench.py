@@ -0,0 +1,68 @@
+"""List-page serialization: ORM + to_dict() + Flask's encoder vs projection + fast provider.
+
+    python benchmarks/serialization_bench.py --rows 5000 --page 500
+
+Seeds a temporary SQLite database, then times building one JSON page
+both ways. orjson is used when installed.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask.json.provider import DefaultJSONProvider
+from src.main import create_app
+from src.models.user import db
+from src.models.forms import PrayerRequest
+from src.services import json_provider
+from src.services.pagination import newest_first
+from src.services.serializers import parse_fields, projection
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--page', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', 'EMAIL_QUEUE_MODE': 'process'})
+    with app.test_request_context():
+        app.preprocess_request()
+        db.session.execute(db.insert(PrayerRequest), [
+            {'name': f'Name {i}', 'email': f'user{i}@example.com', 'request': 'Please pray for us. ' * 10,
+             'category': 'family', 'is_anonymous': i % 3 == 0, 'language': 'en'}
+            for i in range(args.rows)
+        ])
+        db.session.commit()
+
+        default_provider = DefaultJSONProvider(app)
+        fast_provider = json_provider.FastJSONProvider(app)
+        columns, serialize = projection(PrayerRequest, parse_fields(PrayerRequest, None))
+
+        def before():
+            items = newest_first(PrayerRequest.query, PrayerRequest).limit(args.page).all()
+            body = default_provider.response({'prayer_requests': [item.to_dict() for item in items]}).get_data()
+            db.session.expunge_all()
+            return body
+
+        def after():
+            rows = newest_first(PrayerRequest.query.with_entities(*columns), PrayerRequest).limit(args.page).all()
+            return fast_provider.response({'prayer_requests': [serialize(row) for row in rows]}).get_data()
+
+        assert app.json.loads(before()) == app.json.loads(after()), 'outputs differ'
+        for name, func in (('before', before), ('after', after)):
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                func()
+            elapsed = (time.perf_counter() - start) / args.repeat * 1000
+            print(f'{name:<8} {elapsed:8.2f} ms per {args.page}-row page')
+        print(f"encoder: {'orjson' if json_provider.orjson else 'json (stdlib)'}")
+
+
+if __name__ == '__main__':
+    main()
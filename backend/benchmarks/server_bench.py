@@ -0,0 +1,105 @@
+"""Throughput of the dev server vs the production gunicorn setup.
+
+    python benchmarks/server_bench.py --concurrency 16 --requests 400
+
+Runs the same scenarios as ``load_test.py`` against, in turn, the old
+``app.run(debug=True)`` entry point (Werkzeug dev server, debugger and
+reloader on) and ``gunicorn -c gunicorn.conf.py``, each on a fresh
+temporary SQLite database with email delivery left to a separate process.
+"""
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from load_test import SCENARIOS, Client, _free_port, run_scenario
+
+DEV_SERVER = (
+    "from src.main import app; "
+    "app.run(host='127.0.0.1', port={port}, debug=True)"
+)
+
+DEFAULT_SCENARIOS = 'prayer_request,list_prayer_requests,list_contact_submissions'
+
+
+def _wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+def start(server, port, workdir):
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, f'{server}.db')}",
+        EMAIL_QUEUE_MODE='process', RATE_LIMIT_ENABLED='False', DEDUP_WINDOW='0',
+        HOST='127.0.0.1', PORT=str(port),
+    )
+    if server == 'dev':
+        command = [sys.executable, '-c', DEV_SERVER.format(port=port)]
+    else:
+        command = ['gunicorn', '-c', 'gunicorn.conf.py']
+    # Own session, so the reloader's child or the workers go down with it
+    return subprocess.Popen(
+        command, cwd=BACKEND, env=env, start_new_session=True,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def stop(process):
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(30)
+    except (ProcessLookupError, subprocess.TimeoutExpired):
+        os.killpg(process.pid, signal.SIGKILL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=400, help='requests per scenario')
+    parser.add_argument('--scenarios', default=DEFAULT_SCENARIOS, help='comma separated subset')
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    workdir = tempfile.mkdtemp(prefix='chatat-server-')
+    results = {}
+    for server in ('dev', 'gunicorn'):
+        port = _free_port()
+        process = start(server, port, workdir)
+        try:
+            if not _wait_for_port(port):
+                raise SystemExit(f'{server} server failed to start')
+            client = Client(port)
+            # First request runs migrations; keep it out of the numbers
+            client.request('GET', '/api/prayer-requests')
+            for index, name in enumerate(scenarios):
+                run_scenario(client, SCENARIOS[name], min(20, args.requests), args.concurrency, 10**6 * (index + 1))
+                results[(server, name)] = run_scenario(client, SCENARIOS[name], args.requests, args.concurrency, 0)
+        finally:
+            stop(process)
+
+    print(f"{'scenario':<26}{'server':<10}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for name in scenarios:
+        for server in ('dev', 'gunicorn'):
+            result = results[(server, name)]
+            latency = result['latency_ms']
+            print(f"{name:<26}{server:<10}{result['throughput_rps']:>9}{latency['p50']:>9}"
+                  f"{latency['p95']:>9}{latency['p99']:>9}{result['errors']:>8}")
+
+
+if __name__ == '__main__':
+    main()
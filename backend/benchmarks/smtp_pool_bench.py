@@ -0,0 +1,90 @@
+"""Compare per-message Flask-Mail sessions with the pooled SMTP layer.
+
+Runs against the local SMTP sink, so no network or credentials are needed:
+
+    python benchmarks/smtp_pool_bench.py --messages 500
+
+The ``--drop-after`` run makes the sink hang up every N messages and checks
+that the pool reconnects without losing any mail.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask_mail import Message
+from src.services.email_service import mail, EmailService
+from src.services.smtp_pool import smtp_pool
+from smtp_sink import SMTPSink
+
+
+def make_app(port):
+    app = Flask(__name__)
+    app.config.update(
+        MAIL_SERVER='127.0.0.1',
+        MAIL_PORT=port,
+        MAIL_USE_TLS=False,
+        MAIL_USE_SSL=False,
+        MAIL_DEFAULT_SENDER='bench@localhost',
+    )
+    mail.init_app(app)
+    smtp_pool.init_app(app)
+    return app
+
+
+def bench_flask_mail(app, count):
+    with app.app_context():
+        start = time.perf_counter()
+        for i in range(count):
+            mail.send(Message(subject=f'msg {i}', recipients=['user@localhost'], html='<p>hi</p>'))
+        return time.perf_counter() - start
+
+
+def bench_pool(app, count, batch):
+    service = EmailService()
+    with app.app_context():
+        start = time.perf_counter()
+        for offset in range(0, count, batch):
+            with smtp_pool.connection() as connection:
+                for i in range(offset, min(offset + batch, count)):
+                    service._send_email('user@localhost', f'msg {i}', '<p>hi</p>', is_html=True,
+                                        connection=connection)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--messages', type=int, default=200)
+    parser.add_argument('--batch', type=int, default=2, help='messages sent per borrowed connection')
+    parser.add_argument('--drop-after', type=int, default=5)
+    args = parser.parse_args()
+
+    with SMTPSink() as sink:
+        app = make_app(sink.port)
+        elapsed = bench_flask_mail(app, args.messages)
+        print(f'flask-mail : {args.messages / elapsed:8.1f} msg/s, '
+              f'{sink.connections} connections for {sink.messages} messages')
+
+    with SMTPSink() as sink:
+        app = make_app(sink.port)
+        elapsed = bench_pool(app, args.messages, args.batch)
+        print(f'smtp pool  : {args.messages / elapsed:8.1f} msg/s, '
+              f'{sink.connections} connections for {sink.messages} messages')
+        smtp_pool.close_all()
+
+    with SMTPSink(drop_after=args.drop_after) as sink:
+        app = make_app(sink.port)
+        bench_pool(app, args.messages, args.batch)
+        smtp_pool.close_all()
+        status = 'ok' if sink.messages == args.messages else 'LOST MAIL'
+        print(f'reconnect  : {sink.messages}/{args.messages} delivered with the server dropping '
+              f'every {args.drop_after} messages ({sink.connections} connections) - {status}')
+        if sink.messages != args.messages:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
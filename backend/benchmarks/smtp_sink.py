@@ -0,0 +1,90 @@
+"""Minimal local SMTP sink used by the benchmarks.
+
+Speaks just enough SMTP (EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT) for
+smtplib and Flask-Mail, stores nothing but counters, and can drop sessions
+after a number of messages to exercise reconnect logic. It stands in for an
+``aiosmtpd`` server without adding a dependency.
+"""
+import socketserver
+import threading
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line):
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        session_messages = 0
+        self._reply('220 localhost smtp-sink ready')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8', 'replace').strip().upper()
+            if command.startswith('EHLO'):
+                self.wfile.write(b'250-localhost\r\n250 8BITMIME\r\n')
+            elif command.startswith('HELO'):
+                self._reply('250 localhost')
+            elif command.startswith(('MAIL', 'RCPT', 'RSET', 'NOOP')):
+                self._reply('250 OK')
+            elif command == 'DATA':
+                self._reply('354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                session_messages += 1
+                with server.lock:
+                    server.messages += 1
+                self._reply('250 OK queued')
+                if server.drop_after and session_messages >= server.drop_after:
+                    # Simulate a relay that hangs up on long-lived sessions
+                    return
+            elif command == 'QUIT':
+                self._reply('221 Bye')
+                return
+            else:
+                self._reply('502 Command not implemented')
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='127.0.0.1', port=0, drop_after=None):
+        super().__init__((host, port), _SMTPHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = 0
+        self.drop_after = drop_after
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run a local SMTP sink')
+    parser.add_argument('--port', type=int, default=2525)
+    parser.add_argument('--drop-after', type=int, default=None)
+    args = parser.parse_args()
+
+    with SMTPSink(port=args.port, drop_after=args.drop_after) as sink:
+        print(f'SMTP sink listening on 127.0.0.1:{sink.port}')
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            print(f'{sink.messages} messages over {sink.connections} connections')
@@ -0,0 +1,83 @@
+"""Writes/sec with N parallel submitters, default SQLite settings vs tuned.
+
+    python benchmarks/sqlite_concurrency_bench.py --writers 8 --writes 200
+
+Each writer thread inserts prayer requests one transaction at a time into a
+temporary database file, as concurrent form submissions would.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy.exc import OperationalError
+from src.models.user import db
+from src.models.forms import PrayerRequest
+from src.db_config import init_database_config, configure_engine
+
+
+def make_app(path, tuned):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    if tuned:
+        init_database_config(app)
+    else:
+        # pysqlite defaults: rollback journal, 5 s lock wait, no PRAGMAs
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'connect_args': {'check_same_thread': False}}
+    db.init_app(app)
+    with app.app_context():
+        if tuned:
+            configure_engine(db.engine, app.config)
+        db.create_all()
+    return app
+
+
+def run(app, writers, writes):
+    errors = []
+    barrier = threading.Barrier(writers + 1)
+
+    def writer(n):
+        with app.app_context():
+            barrier.wait()
+            for i in range(writes):
+                try:
+                    db.session.add(PrayerRequest(request=f'writer {n} request {i}', category='general'))
+                    db.session.commit()
+                except OperationalError as e:
+                    db.session.rollback()
+                    errors.append(str(e.orig))
+            db.session.remove()
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return (writers * writes - len(errors)) / elapsed, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--writes', type=int, default=200, help='writes per writer')
+    args = parser.parse_args()
+
+    for label, tuned in (('default', False), ('tuned  ', True)):
+        with tempfile.TemporaryDirectory() as tmp:
+            app = make_app(os.path.join(tmp, 'bench.db'), tuned)
+            rate, errors = run(app, args.writers, args.writes)
+            with app.app_context():
+                db.engine.dispose()
+        print(f'{label}: {rate:8.0f} writes/s with {args.writers} writers, {len(errors)} lock errors')
+
+
+if __name__ == '__main__':
+    main()
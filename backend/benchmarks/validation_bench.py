@@ -0,0 +1,92 @@
+"""Validation/sanitization cost on typical, large and adversarial input.
+
+    python benchmarks/validation_bench.py --repeat 20
+
+"before" is the previous implementation (pattern looked up per call, the
+whole text scanned and then truncated); "after" is src.services.validation.
+The last section posts an oversized body through the app to show it is
+refused with 413 before any JSON parsing.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+from src.services import validation
+
+
+def before_validate_email(email):
+    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    return re.match(pattern, email) is not None
+
+
+def before_sanitize_input(text):
+    if not text:
+        return ""
+    text = re.sub(r'<[^>]*>', '', str(text))
+    return text[:5000]
+
+
+CASES = {
+    'typical message': 'Please pray for my <b>family</b> and friends. ' * 20,
+    'large text (2 MB)': 'Lorem ipsum dolor sit amet <i>x</i> ' * 60000,
+    # Unclosed '<' makes every match attempt scan to the end of the text
+    'unclosed tags (20k)': '<' * 20000,
+    'unclosed tags (2 MB)': '<' * 2000000,
+}
+EMAILS = {
+    'typical email': 'jane.doe@example.com',
+    'long domain email': 'a@' + 'a.' * 50000 + '!',
+}
+
+
+def measure(func, value, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(value)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def post_oversized(size):
+    from src.main import create_app
+    app = create_app()
+    client = app.test_client()
+    # First request runs the migrations; keep that out of the timing
+    client.get('/api/health')
+    body = json.dumps({'request': 'x' * size, 'isAnonymous': True})
+    start = time.perf_counter()
+    response = client.post('/api/prayer-request', data=body, content_type='application/json')
+    return response.status_code, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--max-before-chars', type=int, default=100000,
+                        help='skip "before" on inputs longer than this (it is quadratic on unclosed tags)')
+    args = parser.parse_args()
+
+    print(f"{'input':<24}{'before ms':>14}{'after ms':>12}")
+    for name, text in CASES.items():
+        after = measure(validation.sanitize_input, text, args.repeat)
+        if len(text) <= args.max_before_chars or '>' in text:
+            before = f'{measure(before_sanitize_input, text, max(1, args.repeat // 10)):14.3f}'
+        else:
+            before = f"{'(skipped)':>14}"
+        print(f'{name:<24}{before}{after:12.3f}')
+    for name, email in EMAILS.items():
+        before = measure(before_validate_email, email, args.repeat)
+        after = measure(validation.validate_email, email, args.repeat)
+        print(f'{name:<24}{before:14.3f}{after:12.3f}')
+
+    status, elapsed = post_oversized(4 * 1024 * 1024)
+    print(f'\n4 MB POST /api/prayer-request -> {status} in {elapsed:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Production server settings.
+
+    cd backend && gunicorn -c gunicorn.conf.py
+
+Preforking gunicorn with threaded (gthread) workers. The app is imported
+once in the master (``preload_app``), migrations run and email templates
+compile there before any worker is forked, so workers start with warm,
+copy-on-write shared state. Each worker then gets its own connection pool
+(``post_fork``) and stops its email queue threads cleanly on exit.
+
+Reloading:
+  - ``kill -HUP <master>``: new workers replace old ones gracefully (in-flight
+    requests get ``graceful_timeout`` seconds); config and environment are
+    reread, but preloaded application code is not.
+  - ``kill -USR2 <master>`` then ``kill -QUIT <old master>``: zero-downtime
+    restart onto new application code.
+
+``WEB_CONCURRENCY`` and ``WEB_THREADS`` override the CPU-based defaults;
+``WEB_THREADS`` also sizes the per-worker DB pool (see db_config).
+"""
+import multiprocessing
+import os
+
+wsgi_app = 'src.main:app'
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}"
+
+# SQLite takes one writer at a time, so more processes than cores only add
+# lock contention; threads cover requests waiting on I/O.
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() + 1))
+worker_class = 'gthread'
+threads = int(os.getenv('WEB_THREADS', 4))
+
+preload_app = True
+timeout = int(os.getenv('WEB_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('WEB_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+# Recycle workers now and then so slow leaks cannot accumulate
+max_requests = int(os.getenv('WEB_MAX_REQUESTS', 5000))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.getenv('WEB_ACCESS_LOG') or None
+errorlog = '-'
+
+
+def when_ready(server):
+    """Master, after preloading and before the first fork: one-time warm-up"""
+    from src.main import app
+    from src.models.user import db
+    from src.db_config import prepare_database
+    from src.services import email_templates
+
+    email_templates.precompile()
+    with app.app_context():
+        prepare_database(app, db)
+        # No pooled connection may be shared with the workers
+        db.engine.dispose()
+    server.log.info('Application warmed up; forking workers')
+
+
+def post_fork(server, worker):
+    """Worker: start from an empty DB pool instead of the master's"""
+    from src.main import app
+    from src.models.user import db
+
+    # Caps SSE streams so they cannot take every request thread
+    app.config['SERVER_THREADS'] = server.cfg.threads
+    with app.app_context():
+        # close=False leaves any inherited sockets to the master
+        db.engine.dispose(close=False)
+
+
+def worker_exit(server, worker):
+    """Let email queue threads finish their batch before the worker exits"""
+    from src.services.email_queue import email_queue
+
+    if email_queue.app is not None:
+        email_queue.stop(timeout=graceful_timeout)
@@ -0,0 +1,66 @@
+"""baseline: user, prayer_request and contact_submission
+
+Revision ID: 0001_baseline
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+Matches the schema that db.create_all() produced before migrations were
+introduced. Tables that already exist in such databases are left alone,
+so `db upgrade` adopts them without a manual stamp.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_baseline'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'user' not in existing:
+        op.create_table('user',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('username', sa.String(length=80), nullable=False),
+            sa.Column('email', sa.String(length=120), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('email'),
+            sa.UniqueConstraint('username')
+        )
+    if 'prayer_request' not in existing:
+        op.create_table('prayer_request',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=100), nullable=True),
+            sa.Column('email', sa.String(length=120), nullable=True),
+            sa.Column('request', sa.Text(), nullable=False),
+            sa.Column('category', sa.String(length=50), nullable=False),
+            sa.Column('is_anonymous', sa.Boolean(), nullable=True),
+            sa.Column('language', sa.String(length=10), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('is_processed', sa.Boolean(), nullable=True),
+            sa.Column('admin_notes', sa.Text(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+    if 'contact_submission' not in existing:
+        op.create_table('contact_submission',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('email', sa.String(length=120), nullable=False),
+            sa.Column('subject', sa.String(length=200), nullable=False),
+            sa.Column('message', sa.Text(), nullable=False),
+            sa.Column('language', sa.String(length=10), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('is_responded', sa.Boolean(), nullable=True),
+            sa.Column('admin_notes', sa.Text(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+
+def downgrade():
+    op.drop_table('contact_submission')
+    op.drop_table('prayer_request')
+    op.drop_table('user')
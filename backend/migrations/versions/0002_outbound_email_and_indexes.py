@@ -0,0 +1,55 @@
+"""outbound email queue and (created_at, id) listing indexes
+
+Revision ID: 0002_outbound_email_and_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-18 09:10:00.000000
+
+Databases that ran the app between the queue/index changes and the move to
+migrations may already have these objects from db.create_all(), so each
+one is only created when missing.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_outbound_email_and_indexes'
+down_revision = '0001_baseline'
+branch_labels = None
+depends_on = None
+
+
+def _index_names(inspector, table):
+    return {index['name'] for index in inspector.get_indexes(table)}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table('outbound_email'):
+        op.create_table('outbound_email',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('kind', sa.String(length=50), nullable=False),
+            sa.Column('submission_id', sa.Integer(), nullable=False),
+            sa.Column('recipient', sa.String(length=120), nullable=False),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('attempts', sa.Integer(), nullable=False),
+            sa.Column('last_error', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('next_attempt_at', sa.DateTime(), nullable=True),
+            sa.Column('sent_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+    if 'ix_outbound_email_status' not in _index_names(inspector, 'outbound_email'):
+        op.create_index('ix_outbound_email_status', 'outbound_email', ['status'], unique=False)
+    if 'ix_prayer_request_created_at_id' not in _index_names(inspector, 'prayer_request'):
+        op.create_index('ix_prayer_request_created_at_id', 'prayer_request', ['created_at', 'id'], unique=False)
+    if 'ix_contact_submission_created_at_id' not in _index_names(inspector, 'contact_submission'):
+        op.create_index('ix_contact_submission_created_at_id', 'contact_submission', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_contact_submission_created_at_id', table_name='contact_submission')
+    op.drop_index('ix_prayer_request_created_at_id', table_name='prayer_request')
+    op.drop_index('ix_outbound_email_status', table_name='outbound_email')
+    op.drop_table('outbound_email')
@@ -0,0 +1,44 @@
+"""partial indexes on unprocessed prayer requests and unanswered contacts
+
+Revision ID: 0003_pending_partial_indexes
+Revises: 0002_outbound_email_and_indexes
+Create Date: 2026-10-18 13:40:00.000000
+
+Only rows still waiting for an admin are indexed, so the pending queue
+query (``is_processed=false`` newest first) stays an index range scan
+however many handled rows accumulate.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_pending_partial_indexes'
+down_revision = '0002_outbound_email_and_indexes'
+branch_labels = None
+depends_on = None
+
+PARTIAL_INDEXES = (
+    ('ix_prayer_request_pending', 'prayer_request', 'is_processed'),
+    ('ix_contact_submission_pending', 'contact_submission', 'is_responded'),
+)
+
+
+def _index_names(inspector, table):
+    return {index['name'] for index in inspector.get_indexes(table)}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    for name, table, status in PARTIAL_INDEXES:
+        if name not in _index_names(inspector, table):
+            op.create_index(
+                name, table, ['created_at', 'id'], unique=False,
+                sqlite_where=sa.text(f'{status} = 0'), postgresql_where=sa.text(f'NOT {status}')
+            )
+
+
+def downgrade():
+    for name, table, _ in reversed(PARTIAL_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,51 @@
+"""submission_count counter table, backfilled from existing rows
+
+Revision ID: 0004_submission_counts
+Revises: 0003_pending_partial_indexes
+Create Date: 2026-10-18 14:20:00.000000
+
+The app keeps the counters current from here on; the backfill runs only
+when the table is created, mirroring ``src.services.stats.rebuild_counts``.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_submission_counts'
+down_revision = '0003_pending_partial_indexes'
+branch_labels = None
+depends_on = None
+
+# (table, dimension, bucket expression)
+BACKFILL = (
+    ('prayer_request', 'category', "COALESCE(category, '')"),
+    ('prayer_request', 'language', "COALESCE(language, '')"),
+    ('prayer_request', 'day', "COALESCE(SUBSTR(CAST(created_at AS VARCHAR), 1, 10), '')"),
+    ('prayer_request', 'is_processed', "CASE WHEN is_processed = true THEN 'true' ELSE 'false' END"),
+    ('contact_submission', 'language', "COALESCE(language, '')"),
+    ('contact_submission', 'day', "COALESCE(SUBSTR(CAST(created_at AS VARCHAR), 1, 10), '')"),
+    ('contact_submission', 'is_responded', "CASE WHEN is_responded = true THEN 'true' ELSE 'false' END"),
+)
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('submission_count'):
+        return
+
+    op.create_table('submission_count',
+        sa.Column('table', sa.String(length=50), nullable=False),
+        sa.Column('dimension', sa.String(length=20), nullable=False),
+        sa.Column('bucket', sa.String(length=50), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('table', 'dimension', 'bucket')
+    )
+    for table, dimension, bucket in BACKFILL:
+        op.execute(
+            f'INSERT INTO submission_count ("table", dimension, bucket, count) '
+            f"SELECT '{table}', '{dimension}', {bucket}, COUNT(*) FROM {table} GROUP BY 1, 2, 3"
+        )
+
+
+def downgrade():
+    op.drop_table('submission_count')
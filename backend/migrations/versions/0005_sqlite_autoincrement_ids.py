@@ -0,0 +1,105 @@
+"""never reuse submission ids on SQLite (AUTOINCREMENT)
+
+Revision ID: 0005_sqlite_autoincrement_ids
+Revises: 0004_submission_counts
+Create Date: 2026-10-18 16:10:00.000000
+
+A plain ``INTEGER PRIMARY KEY`` hands out ``max(id) + 1``, so once the
+retention job archives and deletes the newest rows their ids come back.
+That would collide with the archive, SSE resume ids and dedup results.
+The tables are rebuilt with AUTOINCREMENT, and the sequence is started
+after any id already in a main-database archive table. PostgreSQL
+sequences never reuse ids, so other databases are left alone. Rebuilding
+a table drops its full-text search triggers; they are recreated here
+(same definitions as ``src.services.search``) so rows submitted before
+the next app start are still indexed. The copied rows keep their ids, so
+the FTS index itself stays valid.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_sqlite_autoincrement_ids'
+down_revision = '0004_submission_counts'
+branch_labels = None
+depends_on = None
+
+# (table, its archive table)
+TABLES = (
+    ('prayer_request', 'prayer_request_archive'),
+    ('contact_submission', 'contact_submission_archive'),
+)
+
+# Full-text search columns per table, as in src.services.search
+SEARCH_COLUMNS = {
+    'prayer_request': ('request',),
+    'contact_submission': ('subject', 'message'),
+}
+
+
+def _has_autoincrement(bind, table):
+    sql = bind.execute(
+        sa.text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"), {'name': table}
+    ).scalar()
+    return 'AUTOINCREMENT' in (sql or '').upper()
+
+
+def _max_id(bind, table):
+    return bind.execute(sa.text(f'SELECT COALESCE(MAX(id), 0) FROM {table}')).scalar()
+
+
+def _recreate_search_triggers(bind, table):
+    fts = f'{table}_fts'
+    exists = bind.execute(
+        sa.text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {'name': fts}
+    ).first()
+    if not exists:
+        return
+    columns = SEARCH_COLUMNS[table]
+    column_list = ', '.join(columns)
+    new_values = ', '.join(f'new.{c}' for c in columns)
+    old_values = ', '.join(f'old.{c}' for c in columns)
+    bind.exec_driver_sql(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+    )
+    bind.exec_driver_sql(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); END"
+    )
+    bind.exec_driver_sql(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column_list} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+    )
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    tables = set(sa.inspect(bind).get_table_names())
+
+    for table, archive in TABLES:
+        if not _has_autoincrement(bind, table):
+            with op.batch_alter_table(table, recreate='always', table_kwargs={'sqlite_autoincrement': True}):
+                pass
+            _recreate_search_triggers(bind, table)
+        last_id = _max_id(bind, table)
+        if archive in tables:
+            last_id = max(last_id, _max_id(bind, archive))
+        bind.execute(sa.text('DELETE FROM sqlite_sequence WHERE name = :name'), {'name': table})
+        bind.execute(
+            sa.text('INSERT INTO sqlite_sequence (name, seq) VALUES (:name, :seq)'), {'name': table, 'seq': last_id}
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    for table, _ in reversed(TABLES):
+        with op.batch_alter_table(table, recreate='always', table_kwargs={'sqlite_autoincrement': False}):
+            pass
+        _recreate_search_triggers(bind, table)
@@ -2,14 +2,19 @@ import os
 import sys
 from pathlib import Path
 
-# Add the parent directory of your Flask app (the 'src' folder) to the Python path.
+# Add the backend directory (the parent of the 'src' package) to the Python path.
 # This is crucial so that the Netlify Function can find and import your Flask application modules.
 # Assuming your structure is chatat_backend/src/main.py and chatat_backend/netlify_functions/main.py
-sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Import your Flask app instance from your main Flask application file.
-# Make sure 'app' is the name of your Flask application instance in src/main.py
-from main import app as flask_app
+# Import your Flask app instance as src.main: this file is itself loaded as
+# 'main', so a bare `from main import app` would import this module again.
+# Creating the app is cheap; the database, SMTP pool and email templates
+# are initialized on first use, keeping cold starts short.
+# Background threads are frozen once the function returns, so queued mail
+# is sent inline after each commit unless the environment says otherwise.
+os.environ.setdefault('EMAIL_QUEUE_MODE', 'sync')
+from src.main import app as flask_app
 
 # Import the WSGI handler from serverless_wsgi
 from serverless_wsgi import handle_request
@@ -0,0 +1,53 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from a2wsgi import WSGIMiddleware
+from src.main import app as flask_app
+from src.services.email_queue import email_queue
+
+flask_app.config.setdefault('ASGI_THREADS', int(os.getenv('ASGI_THREADS', 8)))
+# Caps SSE streams so they cannot take every handler thread
+flask_app.config['SERVER_THREADS'] = flask_app.config['ASGI_THREADS']
+
+
+def _terminated_input(environ, start_response):
+    # a2wsgi's body stream ends with the request body, so Werkzeug may read
+    # chunked uploads (no Content-Length) to the end
+    environ['wsgi.input_terminated'] = True
+    return flask_app(environ, start_response)
+
+
+# a2wsgi keeps connections and request/response bodies on the event loop and
+# runs the WSGI app in a pool of ASGI_THREADS threads; the views, blueprints
+# and error handlers are the WSGI ones, so responses match WSGI mode exactly.
+wsgi = WSGIMiddleware(_terminated_input, workers=flask_app.config['ASGI_THREADS'])
+
+
+async def app(scope, receive, send):
+    """ASGI entry point: the Flask app via a2wsgi, plus lifespan shutdown"""
+    if scope['type'] != 'lifespan':
+        return await wsgi(scope, receive, send)
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            # Let email queue threads finish their batch
+            await asyncio.get_running_loop().run_in_executor(None, email_queue.stop, 30)
+            wsgi.executor.shutdown(wait=False)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+if __name__ == '__main__':
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit('ASGI mode needs an ASGI server: pip install uvicorn')
+    uvicorn.run(
+        'src.asgi:app', host=os.getenv('HOST', '0.0.0.0'), port=int(os.getenv('PORT', 5000)),
+        lifespan='on', log_level='warning'
+    )
@@ -0,0 +1,161 @@
+import os
+import re
+import threading
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import make_url
+from src.services.search import ensure_search_indexes
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+# PRAGMAs applied to every new SQLite connection. WAL lets readers run
+# alongside a writer, synchronous=NORMAL is durable in WAL mode while only
+# syncing at checkpoints, and busy_timeout makes concurrent writers wait for
+# the lock instead of failing with "database is locked".
+SQLITE_DEFAULTS = {
+    'SQLITE_JOURNAL_MODE': 'WAL',
+    'SQLITE_SYNCHRONOUS': 'NORMAL',
+    'SQLITE_CACHE_SIZE': -20000,        # negative = KiB, i.e. ~20 MB page cache
+    'SQLITE_MMAP_SIZE': 268435456,      # 256 MB memory-mapped reads
+    'SQLITE_BUSY_TIMEOUT': 5000,        # ms
+    'SQLITE_TEMP_STORE': 'MEMORY',
+}
+
+
+def _env(name, default):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return type(default)(value)
+
+
+def database_uri(default_sqlite_path):
+    """``DATABASE_URL`` from the environment, or the local SQLite file"""
+    url = os.getenv('DATABASE_URL')
+    if not url:
+        return f"sqlite:///{default_sqlite_path}"
+    # Some hosts still hand out the pre-SQLAlchemy-1.4 scheme
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+
+def init_database_config(app):
+    """Fill in SQLite tuning and engine/pool options before ``db.init_app``"""
+    app.config.setdefault('DB_AUTO_MIGRATE', _env('DB_AUTO_MIGRATE', 'True').lower() == 'true')
+    app.extensions['db_config'] = {'ready': False, 'lock': threading.Lock()}
+    for name, default in SQLITE_DEFAULTS.items():
+        app.config.setdefault(name, _env(name, default))
+
+    # One connection per worker thread plus headroom for the email queue
+    # threads; beyond that, requests wait for a connection rather than
+    # piling more writers onto the SQLite lock.
+    threads = _env('WEB_THREADS', 4)
+    app.config.setdefault('DB_POOL_SIZE', _env('DB_POOL_SIZE', threads + 2))
+    app.config.setdefault('DB_POOL_MAX_OVERFLOW', _env('DB_POOL_MAX_OVERFLOW', 4))
+    app.config.setdefault('DB_POOL_TIMEOUT', _env('DB_POOL_TIMEOUT', 30))
+
+    options = app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+    if app.config.get('SQLALCHEMY_DATABASE_URI', '').startswith('sqlite'):
+        connect_args = options.setdefault('connect_args', {})
+        # pysqlite's own lock wait, in seconds, mirrors busy_timeout
+        connect_args.setdefault('timeout', app.config['SQLITE_BUSY_TIMEOUT'] / 1000)
+        connect_args.setdefault('check_same_thread', False)
+        if make_url(app.config['SQLALCHEMY_DATABASE_URI']).database in (None, '', ':memory:'):
+            # In-memory databases use a single static connection, not a pool
+            return
+    else:
+        # Server databases close idle connections; check before handing one out
+        options.setdefault('pool_pre_ping', True)
+    options.setdefault('pool_size', app.config['DB_POOL_SIZE'])
+    options.setdefault('max_overflow', app.config['DB_POOL_MAX_OVERFLOW'])
+    options.setdefault('pool_timeout', app.config['DB_POOL_TIMEOUT'])
+
+
+def sqlite_pragmas(config):
+    """PRAGMA statements for the given config mapping"""
+    return [
+        f"PRAGMA journal_mode={config['SQLITE_JOURNAL_MODE']}",
+        f"PRAGMA synchronous={config['SQLITE_SYNCHRONOUS']}",
+        f"PRAGMA cache_size={int(config['SQLITE_CACHE_SIZE'])}",
+        f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}",
+        f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT'])}",
+        f"PRAGMA temp_store={config['SQLITE_TEMP_STORE']}",
+    ]
+
+
+def configure_engine(engine, config):
+    """Apply the SQLite PRAGMAs on every new DBAPI connection of ``engine``"""
+    if engine.dialect.name != 'sqlite':
+        return
+    statements = sqlite_pragmas(config)
+
+    @event.listens_for(engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def init_migrate(app, db):
+    """Register Flask-Migrate; alembic is slow to import, so only on demand"""
+    if 'migrate' in app.extensions:
+        return
+    from flask_migrate import Migrate
+    Migrate(app, db, directory=MIGRATIONS_DIR, render_as_batch=True)
+
+
+_REVISION_RE = re.compile(r"^(down_revision|revision) = '([^']*)'", re.MULTILINE)
+
+
+def head_revision():
+    """Newest migration revision, read straight from the version scripts.
+
+    Lets startup see that the database is already current without importing
+    alembic (a few hundred ms of a serverless cold start).
+    """
+    revisions, parents = set(), set()
+    versions_dir = os.path.join(MIGRATIONS_DIR, 'versions')
+    for filename in os.listdir(versions_dir):
+        if not filename.endswith('.py'):
+            continue
+        with open(os.path.join(versions_dir, filename), encoding='utf-8') as f:
+            for kind, value in _REVISION_RE.findall(f.read()):
+                (revisions if kind == 'revision' else parents).add(value)
+    heads = revisions - parents
+    return heads.pop() if len(heads) == 1 else None
+
+
+def upgrade_schema(app, db):
+    """Apply pending migrations; call inside an app context"""
+    inspector = inspect(db.engine)
+    if inspector.has_table('alembic_version'):
+        with db.engine.connect() as conn:
+            current = conn.exec_driver_sql('SELECT version_num FROM alembic_version').scalar()
+        if current is not None and current == head_revision():
+            return
+
+    from flask_migrate import upgrade
+    init_migrate(app, db)
+    upgrade(MIGRATIONS_DIR)
+
+
+def prepare_database(app, db):
+    """One-time schema work, done on first use instead of at import.
+
+    Runs pending migrations (when ``DB_AUTO_MIGRATE``) and creates the
+    SQLite search indexes. Cheap to call repeatedly; call inside an app
+    context.
+    """
+    state = app.extensions['db_config']
+    if state['ready']:
+        return
+    with state['lock']:
+        if state['ready']:
+            return
+        if app.config['DB_AUTO_MIGRATE']:
+            upgrade_schema(app, db)
+        ensure_search_indexes(db.engine)
+        state['ready'] = True
@@ -3,61 +3,142 @@ import sys
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory
+import click
+from flask import Flask, request
 from flask_cors import CORS
 from dotenv import load_dotenv
 from src.models.user import db
 from src.routes.user import user_bp
 from src.routes.forms import forms_bp
 from src.services.email_service import mail
+from src.services.email_queue import email_queue
+from src.services.smtp_pool import smtp_pool
+from src.services.response_cache import response_cache
+from src.services.submission_guard import submission_guard
+from src.services.metrics import metrics
+from src.services.health import health_checker
+from src.services.retention import retention
+from src.services.events import event_broker
+from src.services.static_files import static_files
+from src.services.json_provider import FastJSONProvider
+from src.db_config import configure_engine, database_uri, init_database_config, init_migrate, prepare_database
 
-# Load environment variables
-load_dotenv()
-
-app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
-app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'asdf#FGSgvasgf$5$WGT')
-
-# Email configuration
-app.config['MAIL_SERVER'] = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
-app.config['MAIL_PORT'] = int(os.getenv('MAIL_PORT', 587))
-app.config['MAIL_USE_TLS'] = os.getenv('MAIL_USE_TLS', 'True').lower() == 'true'
-app.config['MAIL_USE_SSL'] = os.getenv('MAIL_USE_SSL', 'False').lower() == 'true'
-app.config['MAIL_USERNAME'] = os.getenv('MAIL_USERNAME')
-app.config['MAIL_PASSWORD'] = os.getenv('MAIL_PASSWORD')
-app.config['MAIL_DEFAULT_SENDER'] = os.getenv('MAIL_DEFAULT_SENDER')
-
-# Enable CORS for all routes
-CORS(app)
-
-# Initialize email service
-mail.init_app(app)
-
-app.register_blueprint(user_bp, url_prefix='/api')
-app.register_blueprint(forms_bp, url_prefix='/api')
-
-# uncomment if you need to use database
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db.init_app(app)
-with app.app_context():
-    db.create_all()
-
-@app.route('/', defaults={'path': ''})
-@app.route('/<path:path>')
-def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
-            return "Static folder not configured", 404
-
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
-        else:
-            return "index.html not found", 404
+HEALTH_ENDPOINTS = ('forms.health_check', 'forms.readiness_check')
+
+
+def create_app(config=None):
+    """Application factory.
+
+    Only cheap wiring happens here. Anything that touches the database
+    (migrations, search indexes) runs on the first request, the SMTP pool
+    connects on the first send and email templates compile on first render,
+    so importing this module stays fast for serverless cold starts.
+    """
+    # Load environment variables
+    load_dotenv()
+
+    app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+    app.json = FastJSONProvider(app)
+    app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'asdf#FGSgvasgf$5$WGT')
+
+    # Email configuration
+    app.config['MAIL_SERVER'] = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
+    app.config['MAIL_PORT'] = int(os.getenv('MAIL_PORT', 587))
+    app.config['MAIL_USE_TLS'] = os.getenv('MAIL_USE_TLS', 'True').lower() == 'true'
+    app.config['MAIL_USE_SSL'] = os.getenv('MAIL_USE_SSL', 'False').lower() == 'true'
+    app.config['MAIL_USERNAME'] = os.getenv('MAIL_USERNAME')
+    app.config['MAIL_PASSWORD'] = os.getenv('MAIL_PASSWORD')
+    app.config['MAIL_DEFAULT_SENDER'] = os.getenv('MAIL_DEFAULT_SENDER')
+
+    # Database: DATABASE_URL (e.g. postgresql://...) or the bundled SQLite file
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_uri(os.path.join(os.path.dirname(__file__), 'database', 'app.db'))
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    # Request body limits, enforced before JSON parsing (413 when exceeded)
+    app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_CONTENT_LENGTH', 256 * 1024))
+    app.config['MAX_BATCH_CONTENT_LENGTH'] = int(os.getenv('MAX_BATCH_CONTENT_LENGTH', 8 * 1024 * 1024))
+
+    # Shared secret for admin write endpoints (Authorization: Bearer <token>); unset disables them
+    app.config['ADMIN_API_TOKEN'] = os.getenv('ADMIN_API_TOKEN')
+
+    if config:
+        app.config.update(config)
+
+    # Enable CORS for all routes
+    CORS(app)
+
+    # Initialize email service
+    mail.init_app(app)
+    smtp_pool.init_app(app)
+
+    app.register_blueprint(user_bp, url_prefix='/api')
+    app.register_blueprint(forms_bp, url_prefix='/api')
+
+    init_database_config(app)
+    db.init_app(app)
+    email_queue.init_app(app)
+    response_cache.init_app(app)
+    submission_guard.init_app(app)
+    health_checker.init_app(app)
+    retention.init_app(app)
+    event_broker.init_app(app)
+    metrics.init_app(app)
+    if metrics.enabled:
+        metrics.add_collector(
+            'email_queue_messages', 'Outbound emails by queue status', 'gauge',
+            lambda: {(('status', status),): count for status, count in email_queue.status_counts().items()}
+        )
+        metrics.add_collector(
+            'response_cache_events_total', 'Admin response cache lookups and invalidations', 'counter',
+            lambda: _event_counts(response_cache.stats())
+        )
+        metrics.add_collector(
+            'sse_listeners', 'Connected event stream listeners in this process', 'gauge',
+            lambda: {(): event_broker.listener_count}
+        )
+        metrics.add_collector(
+            'submission_guard_events_total', 'Rate limit and duplicate suppression decisions', 'counter',
+            lambda: _event_counts(submission_guard.stats())
+        )
+    with app.app_context():
+        # Registers a connect hook only; no connection is opened here
+        configure_engine(db.engine, app.config)
+        metrics.instrument_engine(db.engine)
+
+    # `flask db ...` commands need Flask-Migrate registered up front
+    if click.get_current_context(silent=True) is not None:
+        init_migrate(app, db)
+
+    @app.before_request
+    def _prepare_database():
+        # Probes must answer even while the database is unavailable
+        if request.endpoint in HEALTH_ENDPOINTS:
+            return
+        # Schema is managed by migrations in backend/migrations; set
+        # DB_AUTO_MIGRATE=False and run `flask --app src.main db upgrade` on deploy
+        prepare_database(app, db)
+
+    # Catch-all for the built frontend; registered last so API routes win
+    static_files.init_app(app)
+
+    return app
+
+
+def _event_counts(stats):
+    """Integer counters of a stats() dict as metric samples labelled by event"""
+    return {
+        (('event', name),): value
+        for name, value in stats.items()
+        if isinstance(value, int) and not isinstance(value, bool) and name not in ('entries',)
+    }
+
+
+app = create_app()
 
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # Development server only; in production run `gunicorn -c gunicorn.conf.py`
+    app.run(
+        host=os.getenv('HOST', '0.0.0.0'), port=int(os.getenv('PORT', 5000)),
+        debug=os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
+    )
@@ -0,0 +1,47 @@
+from datetime import datetime
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, LargeBinary, String
+from sqlalchemy.orm import declarative_base
+
+# Separate from db.Model: archive tables may live in another database
+# (ARCHIVE_DATABASE_URL), so they are created by the retention job rather
+# than by the migrations of the live schema.
+ArchiveBase = declarative_base()
+
+
+class PrayerRequestArchive(ArchiveBase):
+    """Archived prayer request: filter columns plus the zlib-compressed row"""
+    __tablename__ = 'prayer_request_archive'
+    __table_args__ = (
+        Index('ix_prayer_request_archive_created_at_id', 'created_at', 'id'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    created_at = Column(DateTime)
+    category = Column(String(50))
+    language = Column(String(10))
+    is_anonymous = Column(Boolean)
+    is_processed = Column(Boolean)
+    purged = Column(Boolean, nullable=False, default=False)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+    payload = Column(LargeBinary, nullable=False)
+
+    def __repr__(self):
+        return f'<PrayerRequestArchive {self.id}>'
+
+
+class ContactSubmissionArchive(ArchiveBase):
+    """Archived contact submission: filter columns plus the zlib-compressed row"""
+    __tablename__ = 'contact_submission_archive'
+    __table_args__ = (
+        Index('ix_contact_submission_archive_created_at_id', 'created_at', 'id'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    created_at = Column(DateTime)
+    language = Column(String(10))
+    is_responded = Column(Boolean)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+    payload = Column(LargeBinary, nullable=False)
+
+    def __repr__(self):
+        return f'<ContactSubmissionArchive {self.id}>'
@@ -3,6 +3,19 @@ from datetime import datetime
 from src.models.user import db
 
 class PrayerRequest(db.Model):
+    __table_args__ = (
+        # Keyset pagination seeks on (created_at, id) newest first
+        db.Index('ix_prayer_request_created_at_id', 'created_at', 'id'),
+        # Partial index over the unprocessed queue only; stays small as
+        # processed rows accumulate and serves both the filter and the order
+        db.Index(
+            'ix_prayer_request_pending', 'created_at', 'id',
+            sqlite_where=db.text('is_processed = 0'), postgresql_where=db.text('NOT is_processed')
+        ),
+        # Ids of archived rows must never be handed out again
+        {'sqlite_autoincrement': True},
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=True)  # Can be null for anonymous requests
     email = db.Column(db.String(120), nullable=True)  # Can be null for anonymous requests
@@ -32,6 +45,15 @@ class PrayerRequest(db.Model):
         }
 
 class ContactSubmission(db.Model):
+    __table_args__ = (
+        db.Index('ix_contact_submission_created_at_id', 'created_at', 'id'),
+        db.Index(
+            'ix_contact_submission_pending', 'created_at', 'id',
+            sqlite_where=db.text('is_responded = 0'), postgresql_where=db.text('NOT is_responded')
+        ),
+        {'sqlite_autoincrement': True},
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), nullable=False)
@@ -58,3 +80,47 @@ class ContactSubmission(db.Model):
             'admin_notes': self.admin_notes
         }
 
+class SubmissionCount(db.Model):
+    """Running row counts per submission table, dimension and bucket.
+
+    Kept in step with inserts and status changes by src.services.stats in
+    the same transaction; ``python -m src.services.stats`` rebuilds it.
+    """
+    table = db.Column(db.String(50), primary_key=True)  # prayer_request / contact_submission
+    dimension = db.Column(db.String(20), primary_key=True)  # category, language, day, status
+    bucket = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<SubmissionCount {self.table} {self.dimension}={self.bucket}: {self.count}>'
+
+class OutboundEmail(db.Model):
+    """Persistent outbound mail queue, drained by the email queue workers"""
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)  # e.g. prayer_admin, contact_confirmation
+    submission_id = db.Column(db.Integer, nullable=False)
+    recipient = db.Column(db.String(120), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending', index=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<OutboundEmail {self.id} {self.kind} {self.status}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'submission_id': self.submission_id,
+            'recipient': self.recipient,
+            'status': self.status,
+            'attempts': self.attempts,
+            'last_error': self.last_error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'next_attempt_at': self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            'sent_at': self.sent_at.isoformat() if self.sent_at else None
+        }
+
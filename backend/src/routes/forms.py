@@ -1,206 +1,567 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from src.models.user import db
-from src.models.forms import PrayerRequest, ContactSubmission
-from src.services.email_service import EmailService
-import re
+from src.models.forms import PrayerRequest, ContactSubmission, OutboundEmail
+from src.services.email_queue import email_queue, QUEUE_STATUSES
+from src.services.response_cache import response_cache
+from src.services.submission_guard import PENDING, submission_guard
+from src.services.health import health_checker
+from src.services.pagination import count_cache, encode_cursor, keyset_page, newest_first
+from src.services.search import apply_filters
+from src.services.serializers import parse_fields, projection
+from src.services.export import EXPORT_FORMATS, csv_stream, export_columns, iter_chunks, ndjson_stream
+from src.services.validation import CONTACT_SCHEMA, PRAYER_REQUEST_SCHEMA, validate
+from src.services.triage import bulk_update, select_rows, update_values
+from src.services.stats import read_stats, record_inserts
+from src.services.retention import retention
+from src.services.events import event_broker
+from werkzeug.exceptions import RequestEntityTooLarge
 from datetime import datetime
+from functools import wraps
+import hmac
+import math
 
 forms_bp = Blueprint('forms', __name__)
-email_service = EmailService()
-
-def validate_email(email):
-    """Validate email format"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
-
-def sanitize_input(text):
-    """Basic input sanitization"""
-    if not text:
-        return ""
-    # Remove any potential HTML/script tags
-    text = re.sub(r'<[^>]*>', '', str(text))
-    # Limit length to prevent abuse
-    return text[:5000]
+
+# Upper bound on items accepted by one /submissions/batch call
+MAX_BATCH_ITEMS = 500
+
+SUBMISSION_MODELS = {
+    'prayer-requests': PrayerRequest,
+    'contact-submissions': ContactSubmission,
+}
+
+def build_prayer_request(data):
+    """Validate a prayer request payload; returns (PrayerRequest, None) or (None, error)"""
+    values, error = validate(PRAYER_REQUEST_SCHEMA, data)
+    if error:
+        return None, error
+    return PrayerRequest(is_anonymous=bool(data.get('isAnonymous', False)), **values), None
+
+def build_contact_submission(data):
+    """Validate a contact payload; returns (ContactSubmission, None) or (None, error)"""
+    values, error = validate(CONTACT_SCHEMA, data)
+    if error:
+        return None, error
+    return ContactSubmission(**values), None
+
+def _insert_values(submission):
+    """Column values of an unsaved submission for a bulk INSERT, defaults applied"""
+    values = {}
+    for column in submission.__table__.columns:
+        if column.primary_key:
+            continue
+        value = getattr(submission, column.key)
+        if value is None and column.default is not None:
+            value = column.default.arg(None) if column.default.is_callable else column.default.arg
+        values[column.key] = value
+    return values
+
+def _too_many_requests(wait):
+    response = jsonify({'error': 'Too many submissions, please try again later'})
+    response.headers['Retry-After'] = str(math.ceil(wait))
+    return response, 429
+
+def admin_token_required(view=None, allow_query=False):
+    """Reject requests without ``Authorization: Bearer <ADMIN_API_TOKEN>``.
+
+    With ``allow_query`` the token may come as ``?access_token=`` instead,
+    for browser EventSource clients, which cannot send headers.
+    """
+    if view is None:
+        return lambda view: admin_token_required(view, allow_query)
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        token = current_app.config.get('ADMIN_API_TOKEN')
+        if not token:
+            return jsonify({'error': 'Admin API is disabled: set ADMIN_API_TOKEN'}), 403
+        scheme, _, supplied = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() != 'bearer':
+            supplied = request.args.get('access_token', '') if allow_query else ''
+        if not supplied or not hmac.compare_digest(supplied.strip().encode(), token.encode()):
+            return jsonify({'error': 'Invalid or missing admin token'}), 401
+        return view(*args, **kwargs)
+    return wrapper
+
+def _notify_committed():
+    """Wake the email queue and event stream after a committed submission.
+
+    The rows are already saved: a failure here (e.g. a sync-mode drain
+    hitting a locked database) is logged and retried later by the queue,
+    never reported as a failed submission.
+    """
+    try:
+        email_queue.notify()
+        event_broker.notify()
+    except Exception:
+        current_app.logger.exception('Post-commit notification failed')
+
+def _duplicate_response(existing, message):
+    """Reply to a repeat of a recent identical submission without saving it again"""
+    if existing == PENDING:
+        return jsonify({'error': 'An identical submission is already being processed'}), 409
+    return jsonify({
+        'success': True,
+        'message': message,
+        'id': existing,
+        'duplicate': True
+    }), 200
 
 @forms_bp.route('/prayer-request', methods=['POST'])
 def submit_prayer_request():
+    dedup_key = None
     try:
+        wait = submission_guard.check('ip', submission_guard.client_ip())
+        if wait:
+            return _too_many_requests(wait)
+        
         data = request.get_json()
         
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
-        # Validate required fields
-        request_text = data.get('request', '').strip()
-        if not request_text:
-            return jsonify({'error': 'Prayer request text is required'}), 400
-        
-        is_anonymous = data.get('isAnonymous', False)
-        name = data.get('name', '').strip() if not is_anonymous else None
-        email = data.get('email', '').strip() if not is_anonymous else None
-        
-        # Validate non-anonymous submissions
-        if not is_anonymous:
-            if not name:
-                return jsonify({'error': 'Name is required for non-anonymous requests'}), 400
-            if not email:
-                return jsonify({'error': 'Email is required for non-anonymous requests'}), 400
-            if not validate_email(email):
-                return jsonify({'error': 'Invalid email format'}), 400
-        
-        # Sanitize inputs
-        request_text = sanitize_input(request_text)
-        name = sanitize_input(name) if name else None
-        category = sanitize_input(data.get('category', 'general'))
-        language = data.get('language', 'en')
-        
-        # Create prayer request
-        prayer_request = PrayerRequest(
-            name=name,
-            email=email,
-            request=request_text,
-            category=category,
-            is_anonymous=is_anonymous,
-            language=language
-        )
+        prayer_request, error = build_prayer_request(data)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        wait = submission_guard.check('email', prayer_request.email)
+        if wait:
+            return _too_many_requests(wait)
+        
+        dedup_key, existing = submission_guard.claim(prayer_request)
+        if existing is not None:
+            return _duplicate_response(existing, 'Prayer request submitted successfully')
         
         db.session.add(prayer_request)
-        db.session.commit()
+        db.session.flush()
+        record_inserts(PrayerRequest, [_insert_values(prayer_request)])
         
-        # Send email notifications
-        email_sent = email_service.send_prayer_request_notification(prayer_request)
+        # Queue email notifications in the same transaction
+        email_queue.enqueue_prayer_request(prayer_request)
+        db.session.commit()
+        submission_guard.remember(dedup_key, prayer_request.id)
+        count_cache.invalidate(PrayerRequest)
+        response_cache.invalidate(PrayerRequest)
+        _notify_committed()
         
-        response_data = {
+        return jsonify({
             'success': True,
             'message': 'Prayer request submitted successfully',
             'id': prayer_request.id
-        }
-        
-        if not email_sent:
-            response_data['warning'] = 'Prayer request saved but email notification failed'
-        
-        return jsonify(response_data), 201
+        }), 201
         
+    except RequestEntityTooLarge:
+        return jsonify({'error': 'Request body too large'}), 413
     except Exception as e:
         db.session.rollback()
+        submission_guard.release(dedup_key)
         return jsonify({'error': 'Internal server error'}), 500
 
 @forms_bp.route('/contact', methods=['POST'])
 def submit_contact():
+    dedup_key = None
     try:
+        wait = submission_guard.check('ip', submission_guard.client_ip())
+        if wait:
+            return _too_many_requests(wait)
+        
         data = request.get_json()
         
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
-        # Validate required fields
-        name = data.get('name', '').strip()
-        email = data.get('email', '').strip()
-        subject = data.get('subject', '').strip()
-        message = data.get('message', '').strip()
-        
-        if not name:
-            return jsonify({'error': 'Name is required'}), 400
-        if not email:
-            return jsonify({'error': 'Email is required'}), 400
-        if not validate_email(email):
-            return jsonify({'error': 'Invalid email format'}), 400
-        if not subject:
-            return jsonify({'error': 'Subject is required'}), 400
-        if not message:
-            return jsonify({'error': 'Message is required'}), 400
-        
-        # Sanitize inputs
-        name = sanitize_input(name)
-        subject = sanitize_input(subject)
-        message = sanitize_input(message)
-        language = data.get('language', 'en')
-        
-        # Create contact submission
-        contact_submission = ContactSubmission(
-            name=name,
-            email=email,
-            subject=subject,
-            message=message,
-            language=language
-        )
+        contact_submission, error = build_contact_submission(data)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        wait = submission_guard.check('email', contact_submission.email)
+        if wait:
+            return _too_many_requests(wait)
+        
+        dedup_key, existing = submission_guard.claim(contact_submission)
+        if existing is not None:
+            return _duplicate_response(existing, 'Contact form submitted successfully')
         
         db.session.add(contact_submission)
-        db.session.commit()
+        db.session.flush()
+        record_inserts(ContactSubmission, [_insert_values(contact_submission)])
         
-        # Send email notifications
-        email_sent = email_service.send_contact_notification(contact_submission)
+        # Queue email notifications in the same transaction
+        email_queue.enqueue_contact(contact_submission)
+        db.session.commit()
+        submission_guard.remember(dedup_key, contact_submission.id)
+        count_cache.invalidate(ContactSubmission)
+        response_cache.invalidate(ContactSubmission)
+        _notify_committed()
         
-        response_data = {
+        return jsonify({
             'success': True,
             'message': 'Contact form submitted successfully',
             'id': contact_submission.id
-        }
+        }), 201
+        
+    except RequestEntityTooLarge:
+        return jsonify({'error': 'Request body too large'}), 413
+    except Exception as e:
+        db.session.rollback()
+        submission_guard.release(dedup_key)
+        return jsonify({'error': 'Internal server error'}), 500
+
+@forms_bp.route('/submissions/batch', methods=['POST'])
+def submit_batch():
+    """Accept many prayer requests and/or contacts in one transaction.
+
+    Body: ``{"prayer_requests": [...], "contacts": [...]}``. Every item is
+    validated with the single-submission rules; valid items are inserted
+    with one bulk INSERT per table (multi-row where the database can return
+    ordered ids) and their notifications are queued with a single
+    executemany, all in one commit. The response lists
+    per-item results in request order.
+
+    Rate limited like the single endpoints: one token per item from the
+    client's batch bucket (a batch larger than its burst is refused), and
+    each item's email is checked against its own bucket.
+    """
+    try:
+        # Batches get their own, larger body limit
+        request.max_content_length = current_app.config['MAX_BATCH_CONTENT_LENGTH']
+        data = request.get_json()
+        
+        if not isinstance(data, dict):
+            return jsonify({'error': 'No data provided'}), 400
+        
+        groups = (
+            ('prayer_request', data.get('prayer_requests') or [], build_prayer_request),
+            ('contact', data.get('contacts') or [], build_contact_submission),
+        )
+        if not all(isinstance(items, list) for _, items, _ in groups):
+            return jsonify({'error': 'prayer_requests and contacts must be arrays'}), 400
+        
+        total_items = sum(len(items) for _, items, _ in groups)
+        if not total_items:
+            return jsonify({'error': 'No data provided'}), 400
+        max_items = MAX_BATCH_ITEMS
+        if current_app.config['RATE_LIMIT_ENABLED']:
+            max_items = min(max_items, submission_guard.limits('batch')[0])
+        if total_items > max_items:
+            return jsonify({'error': f'A batch may contain at most {max_items} items'}), 413
         
-        if not email_sent:
-            response_data['warning'] = 'Contact form saved but email notification failed'
+        wait = submission_guard.check('batch', submission_guard.client_ip(), cost=total_items)
+        if wait:
+            return _too_many_requests(wait)
         
-        return jsonify(response_data), 201
+        results = []
+        created = []
+        for item_type, items, build in groups:
+            for index, item in enumerate(items):
+                result = {'type': item_type, 'index': index}
+                submission, error = build(item)
+                if not error and submission_guard.check('email', submission.email):
+                    error = 'Too many submissions for this email, please try again later'
+                if error:
+                    result.update(success=False, error=error)
+                else:
+                    result['success'] = True
+                    created.append((result, submission))
+                results.append(result)
         
+        if created:
+            for model in (PrayerRequest, ContactSubmission):
+                group = [(result, submission) for result, submission in created if isinstance(submission, model)]
+                if not group:
+                    continue
+                rows = [_insert_values(submission) for _, submission in group]
+                ids = db.session.execute(
+                    db.insert(model).returning(model.id, sort_by_parameter_order=True),
+                    rows
+                ).scalars().all()
+                record_inserts(model, rows)
+                for (result, submission), new_id in zip(group, ids):
+                    result['id'] = submission.id = new_id
+            
+            # Queue email notifications in the same transaction
+            email_queue.enqueue_bulk([submission for _, submission in created])
+            db.session.commit()
+            for model in (PrayerRequest, ContactSubmission):
+                count_cache.invalidate(model)
+                response_cache.invalidate(model)
+            _notify_committed()
+        
+        return jsonify({
+            'success': bool(created),
+            'created': len(created),
+            'failed': len(results) - len(created),
+            'results': results
+        }), 201 if created else 400
+        
+    except RequestEntityTooLarge:
+        return jsonify({'error': 'Request body too large'}), 413
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': 'Internal server error'}), 500
 
+def _paginated_response(model, items_key):
+    """List rows newest first, by cursor (keyset) or by page number.
+
+    ``?cursor=`` (or ``?cursor=`` empty for the first page) seeks on the
+    (created_at, id) index and skips the COUNT unless ``include_total=1``.
+    The legacy ``?page=`` form keeps its response shape; its total comes
+    from a short-lived count cache. Both forms accept the filters handled
+    by ``apply_filters`` and ``fields=a,b`` to return only those columns;
+    rows are serialized straight from the selected columns.
+    """
+    per_page = max(1, request.args.get('per_page', 10, type=int))
+    include_total = request.args.get('include_total', '').lower() in ('1', 'true')
+    try:
+        query, filter_key = apply_filters(model.query, model, request.args)
+        columns, serialize = projection(model, parse_fields(model, request.args.get('fields')))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    rows = query.with_entities(*columns)
+    
+    if 'cursor' in request.args:
+        try:
+            items, next_cursor = keyset_page(rows, model, request.args['cursor'], per_page)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        
+        response_data = {
+            items_key: [serialize(item) for item in items],
+            'next_cursor': next_cursor,
+            'per_page': per_page
+        }
+        if include_total:
+            response_data['total'] = count_cache.get(model, query, filter_key)
+        return jsonify(response_data)
+    
+    page = max(1, request.args.get('page', 1, type=int))
+    items = newest_first(rows, model).offset((page - 1) * per_page).limit(per_page).all()
+    total = count_cache.get(model, query, filter_key)
+    next_cursor = None
+    if items and page * per_page < total:
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+    
+    return jsonify({
+        items_key: [serialize(item) for item in items],
+        'total': total,
+        'pages': -(-total // per_page),
+        'current_page': page,
+        'next_cursor': next_cursor
+    })
+
 @forms_bp.route('/prayer-requests', methods=['GET'])
+@response_cache.cached(PrayerRequest)
 def get_prayer_requests():
     """Admin endpoint to view prayer requests"""
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
+        return _paginated_response(PrayerRequest, 'prayer_requests')
         
-        prayer_requests = PrayerRequest.query.order_by(
-            PrayerRequest.created_at.desc()
-        ).paginate(
-            page=page, 
-            per_page=per_page, 
-            error_out=False
-        )
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+@forms_bp.route('/contact-submissions', methods=['GET'])
+@response_cache.cached(ContactSubmission)
+def get_contact_submissions():
+    """Admin endpoint to view contact submissions"""
+    try:
+        return _paginated_response(ContactSubmission, 'submissions')
+        
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+@forms_bp.route('/triage/<kind>', methods=['POST'])
+@admin_token_required
+def triage_submissions(kind):
+    """Admin endpoint to set status and notes on many rows at once.
+
+    Requires ``Authorization: Bearer <ADMIN_API_TOKEN>``.
+
+    Body: ``{"ids": [...]}`` or ``{"filter": {...}}`` (the list-endpoint
+    filters) plus ``is_processed``/``is_responded`` and/or ``admin_notes``
+    (``"append_notes": true`` appends instead of replacing). Runs as one
+    set-based UPDATE; returns the number of rows changed.
+    """
+    model = SUBMISSION_MODELS.get(kind)
+    if model is None:
+        return jsonify({'error': f"Unknown kind, expected one of: {', '.join(SUBMISSION_MODELS)}"}), 404
+    
+    try:
+        data = request.get_json()
+        
+        if not isinstance(data, dict):
+            return jsonify({'error': 'No data provided'}), 400
+        
+        try:
+            query = select_rows(model, data)
+            values = update_values(model, data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        updated = bulk_update(model, query, values)
+        db.session.commit()
+        count_cache.invalidate(model)
+        response_cache.invalidate(model)
         
         return jsonify({
-            'prayer_requests': [pr.to_dict() for pr in prayer_requests.items],
-            'total': prayer_requests.total,
-            'pages': prayer_requests.pages,
-            'current_page': page
+            'success': True,
+            'updated': updated
         })
         
+    except RequestEntityTooLarge:
+        return jsonify({'error': 'Request body too large'}), 413
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': 'Internal server error'}), 500
 
-@forms_bp.route('/contact-submissions', methods=['GET'])
-def get_contact_submissions():
-    """Admin endpoint to view contact submissions"""
+@forms_bp.route('/export/<kind>', methods=['GET'])
+@admin_token_required
+def export_submissions(kind):
+    """Admin endpoint to stream submissions as NDJSON or CSV (``?archived=1``: the archive).
+
+    Requires ``Authorization: Bearer <ADMIN_API_TOKEN>``.
+    """
+    model = SUBMISSION_MODELS.get(kind)
+    if model is None:
+        return jsonify({'error': f"Unknown export, expected one of: {', '.join(SUBMISSION_MODELS)}"}), 404
+    
+    export_format = request.args.get('format', 'ndjson').lower()
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"Invalid format, expected one of: {', '.join(EXPORT_FORMATS)}"}), 400
+    
+    archived = request.args.get('archived', '').lower() in ('1', 'true')
+    
+    try:
+        fields = parse_fields(model, request.args.get('fields'))
+        if archived:
+            chunks = retention.archived_chunks(
+                model, request.args, fields, isoformat=export_format == 'csv', cursor=request.args.get('cursor') or None
+            )
+        else:
+            query, _ = apply_filters(model.query, model, request.args)
+            columns, serialize = projection(model, fields, isoformat=export_format == 'csv')
+            chunks = iter_chunks(query.with_entities(*columns), model, serialize, request.args.get('cursor') or None)
+        # Prime the generator so a bad cursor fails before streaming starts
+        first = next(chunks, None)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+    
+    def all_chunks():
+        if first is not None:
+            yield first
+            yield from chunks
+    
+    if export_format == 'csv':
+        body = csv_stream(all_chunks(), export_columns(fields))
+    else:
+        body = ndjson_stream(all_chunks())
+    
+    filename = f"{kind}-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.{export_format}"
+    return Response(
+        stream_with_context(body),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+@forms_bp.route('/stats', methods=['GET'])
+def get_stats():
+    """Admin endpoint with submission counts by category, language, day and status"""
+    try:
+        return jsonify(read_stats())
+        
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+@forms_bp.route('/events', methods=['GET'])
+@admin_token_required(allow_query=True)
+def stream_events():
+    """Admin endpoint streaming new submissions as Server-Sent Events.
+
+    Requires the admin token, as a Bearer header or ``?access_token=``.
+
+    Events are ``prayer_request`` and ``contact_submission`` with the list
+    row as JSON data. Reconnecting clients send ``Last-Event-ID`` (or
+    ``?last_event_id=``) to receive what they missed.
+    """
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    if request.method == 'HEAD':
+        # No body will be read, so do not take a listener slot
+        return Response(mimetype='text/event-stream', headers=headers)
+
+    try:
+        subscription = event_broker.subscribe(
+            request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+        )
+    except ValueError as e:
+        return jsonify({'error': 'Invalid Last-Event-ID'}), 400
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+    
+    if subscription is None:
+        response = jsonify({'error': 'Too many event listeners, please try again later'})
+        response.headers['Retry-After'] = '30'
+        return response, 503
+    
+    listener, backlog = subscription
+    response = Response(event_broker.stream(listener, backlog), mimetype='text/event-stream', headers=headers)
+    # The server closes the body even when the client leaves before the
+    # first chunk, when the generator (and its cleanup) never runs
+    response.call_on_close(lambda: event_broker.unsubscribe(listener))
+    return response
+
+@forms_bp.route('/email-queue', methods=['GET'])
+def get_email_queue():
+    """Admin endpoint to view outbound email status"""
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
+        status = request.args.get('status')
         
-        submissions = ContactSubmission.query.order_by(
-            ContactSubmission.created_at.desc()
-        ).paginate(
-            page=page, 
-            per_page=per_page, 
+        if status and status not in QUEUE_STATUSES:
+            return jsonify({'error': f"Invalid status, expected one of: {', '.join(QUEUE_STATUSES)}"}), 400
+        
+        query = OutboundEmail.query
+        if status:
+            query = query.filter_by(status=status)
+        messages = query.order_by(OutboundEmail.id.desc()).paginate(
+            page=page,
+            per_page=per_page,
             error_out=False
         )
         
         return jsonify({
-            'submissions': [sub.to_dict() for sub in submissions.items],
-            'total': submissions.total,
-            'pages': submissions.pages,
+            'counts': email_queue.status_counts(),
+            'messages': [msg.to_dict() for msg in messages.items],
+            'total': messages.total,
+            'pages': messages.pages,
             'current_page': page
         })
         
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
+@forms_bp.route('/cache-stats', methods=['GET'])
+def get_cache_stats():
+    """Admin endpoint with response cache hit/miss counters for this process"""
+    return jsonify(response_cache.stats())
+
+@forms_bp.route('/rate-limit-stats', methods=['GET'])
+def get_rate_limit_stats():
+    """Admin endpoint with rate limit and dedup counters for this process"""
+    return jsonify(submission_guard.stats())
+
 @forms_bp.route('/health', methods=['GET'])
+@forms_bp.route('/health/live', methods=['GET'])
 def health_check():
-    """Health check endpoint"""
+    """Liveness: the process is up; touches neither the database nor SMTP"""
     return jsonify({
         'status': 'healthy',
         'timestamp': datetime.utcnow().isoformat()
     })
 
+@forms_bp.route('/health/ready', methods=['GET'])
+def readiness_check():
+    """Readiness: cached database and SMTP probe results (503 when not ready)"""
+    ready, report = health_checker.status()
+    return jsonify(report), 200 if ready else 503
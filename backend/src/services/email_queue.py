@@ -0,0 +1,412 @@
+import os
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from src.models.user import db
+from src.models.forms import PrayerRequest, ContactSubmission, OutboundEmail
+from src.services.email_service import EmailService
+from src.services.smtp_pool import smtp_pool
+
+# Which submission model each queued message kind is rendered from
+KIND_MODELS = {
+    'prayer_admin': PrayerRequest,
+    'prayer_confirmation': PrayerRequest,
+    'contact_admin': ContactSubmission,
+    'contact_confirmation': ContactSubmission,
+}
+
+# 'digest' rows are admin notifications held back for the next admin digest
+QUEUE_STATUSES = ('pending', 'digest', 'sending', 'sent', 'failed')
+
+ADMIN_KINDS = ('prayer_admin', 'contact_admin')
+
+# Upper bound on submissions coalesced into a single digest email
+DIGEST_ITEM_LIMIT = 500
+
+
+class EmailQueue:
+    """Persistent outbound mail queue drained by a pool of worker threads.
+
+    Form endpoints only insert ``OutboundEmail`` rows in the same transaction
+    as the submission; rendering and SMTP happen in the workers. Rows are
+    claimed with a conditional UPDATE, so several threads or processes can
+    drain the same table safely.
+
+    Modes (``EMAIL_QUEUE_MODE``):
+      - ``thread``: worker threads inside the web process (default)
+      - ``process``: the web process only enqueues; run
+        ``python -m src.services.email_queue`` to drain in separate processes
+      - ``sync``: drain inline right after the commit (serverless friendly;
+        the Netlify function defaults to it)
+
+    With ``ADMIN_DIGEST_ENABLED`` admin notifications are held as ``digest``
+    rows and coalesced into one email once ``ADMIN_DIGEST_MAX_ITEMS`` are
+    waiting or the oldest has waited ``ADMIN_DIGEST_INTERVAL`` seconds.
+    Prayer requests in ``ADMIN_DIGEST_URGENT_CATEGORIES`` and all user
+    confirmations are still sent individually.
+
+    ``sent`` and ``failed`` rows older than ``EMAIL_QUEUE_KEEP_DAYS`` are
+    deleted by ``prune_batch``, which the retention job runs.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.email_service = EmailService()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+        self._pid = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('EMAIL_QUEUE_MODE', os.getenv('EMAIL_QUEUE_MODE', 'thread'))
+        app.config.setdefault('EMAIL_QUEUE_WORKERS', int(os.getenv('EMAIL_QUEUE_WORKERS', 2)))
+        app.config.setdefault('EMAIL_QUEUE_BATCH_SIZE', int(os.getenv('EMAIL_QUEUE_BATCH_SIZE', 20)))
+        app.config.setdefault('EMAIL_QUEUE_MAX_ATTEMPTS', int(os.getenv('EMAIL_QUEUE_MAX_ATTEMPTS', 5)))
+        app.config.setdefault('EMAIL_QUEUE_POLL_INTERVAL', float(os.getenv('EMAIL_QUEUE_POLL_INTERVAL', 5)))
+        app.config.setdefault('EMAIL_QUEUE_RETRY_DELAY', float(os.getenv('EMAIL_QUEUE_RETRY_DELAY', 30)))
+        app.config.setdefault('EMAIL_QUEUE_STALE_AFTER', float(os.getenv('EMAIL_QUEUE_STALE_AFTER', 300)))
+        app.config.setdefault('EMAIL_QUEUE_KEEP_DAYS', int(os.getenv('EMAIL_QUEUE_KEEP_DAYS', 30)))
+        app.config.setdefault('ADMIN_DIGEST_ENABLED', os.getenv('ADMIN_DIGEST_ENABLED', 'False').lower() == 'true')
+        app.config.setdefault('ADMIN_DIGEST_INTERVAL', float(os.getenv('ADMIN_DIGEST_INTERVAL', 900)))
+        app.config.setdefault('ADMIN_DIGEST_MAX_ITEMS', int(os.getenv('ADMIN_DIGEST_MAX_ITEMS', 50)))
+        app.config.setdefault('ADMIN_DIGEST_URGENT_CATEGORIES', [
+            category.strip().lower()
+            for category in os.getenv('ADMIN_DIGEST_URGENT_CATEGORIES', 'urgent').split(',')
+            if category.strip()
+        ])
+        self.app = app
+        app.extensions['email_queue'] = self
+
+    @property
+    def mode(self):
+        return self.app.config['EMAIL_QUEUE_MODE']
+
+    # -- producer side -------------------------------------------------
+
+    def enqueue(self, kind, submission, recipient, status='pending'):
+        """Add a message to the current session; committed with the submission"""
+        if kind not in KIND_MODELS:
+            raise ValueError(f"Unknown email kind: {kind}")
+        outbound = OutboundEmail(
+            kind=kind,
+            submission_id=submission.id,
+            recipient=recipient,
+            status=status
+        )
+        db.session.add(outbound)
+        return outbound
+
+    def _messages_for(self, submission):
+        """(kind, recipient, status) for every notification a submission triggers"""
+        if isinstance(submission, PrayerRequest):
+            messages = [('prayer_admin', self.email_service.admin_email,
+                         self._admin_status(submission.category))]
+            # User confirmation only if not anonymous
+            if not submission.is_anonymous and submission.email:
+                messages.append(('prayer_confirmation', submission.email, 'pending'))
+            return messages
+        return [
+            ('contact_admin', self.email_service.admin_email, self._admin_status()),
+            ('contact_confirmation', submission.email, 'pending'),
+        ]
+
+    def enqueue_prayer_request(self, prayer_request):
+        """Queue admin notification and (if not anonymous) user confirmation"""
+        return [self.enqueue(kind, prayer_request, recipient, status)
+                for kind, recipient, status in self._messages_for(prayer_request)]
+
+    def enqueue_contact(self, contact_submission):
+        """Queue admin notification and user confirmation"""
+        return [self.enqueue(kind, contact_submission, recipient, status)
+                for kind, recipient, status in self._messages_for(contact_submission)]
+
+    def enqueue_bulk(self, submissions):
+        """Queue notifications for many submissions with one executemany INSERT"""
+        now = datetime.utcnow()
+        rows = [
+            {
+                'kind': kind,
+                'submission_id': submission.id,
+                'recipient': recipient,
+                'status': status,
+                'attempts': 0,
+                'created_at': now,
+                'next_attempt_at': now,
+            }
+            for submission in submissions
+            for kind, recipient, status in self._messages_for(submission)
+        ]
+        if rows:
+            db.session.execute(db.insert(OutboundEmail), rows)
+        return len(rows)
+
+    def _admin_status(self, category=None):
+        """Initial status for an admin notification: held for the digest or sent now"""
+        config = self.app.config
+        if not config['ADMIN_DIGEST_ENABLED']:
+            return 'pending'
+        if category and category.lower() in config['ADMIN_DIGEST_URGENT_CATEGORIES']:
+            return 'pending'
+        return 'digest'
+
+    def notify(self):
+        """Signal that new rows were committed"""
+        if self.mode == 'sync':
+            self.drain()
+        elif self.mode == 'thread':
+            self.start()
+            self._wakeup.set()
+
+    # -- worker pool ---------------------------------------------------
+
+    def start(self):
+        """Start the worker threads (idempotent, restarted after fork)"""
+        with self._lock:
+            if self._pid == os.getpid() and self._threads:
+                return
+            self._pid = os.getpid()
+            self._stopping.clear()
+            self._threads = []
+            for i in range(max(1, self.app.config['EMAIL_QUEUE_WORKERS'])):
+                thread = threading.Thread(
+                    target=self._worker_loop,
+                    name=f'email-queue-{i}',
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        """Ask the workers to finish their current batch and exit"""
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _worker_loop(self):
+        with self.app.app_context():
+            requeued_at = 0
+            while not self._stopping.is_set():
+                self._wakeup.clear()
+                try:
+                    # Rows a crashed worker (any process) left in 'sending'
+                    if time.monotonic() - requeued_at >= self.app.config['EMAIL_QUEUE_STALE_AFTER']:
+                        self.requeue_stale()
+                        requeued_at = time.monotonic()
+                    processed = self.process_batch()
+                except Exception:
+                    db.session.rollback()
+                    self.app.logger.error(f"Email queue worker error: {traceback.format_exc()}")
+                    processed = 0
+                finally:
+                    db.session.remove()
+                if not processed:
+                    self._wakeup.wait(self.app.config['EMAIL_QUEUE_POLL_INTERVAL'])
+
+    def drain(self):
+        """Process batches until nothing is due; returns the number handled.
+
+        Starts by requeueing rows stuck in 'sending', since sync and process
+        modes have no long-lived worker loop to do it.
+        """
+        self.requeue_stale()
+        total = 0
+        while True:
+            processed = self.process_batch()
+            if not processed:
+                return total
+            total += processed
+
+    # -- consumer side -------------------------------------------------
+
+    def _claim(self, limit, from_status='pending'):
+        """Atomically move up to ``limit`` due rows from ``from_status`` to sending"""
+        now = datetime.utcnow()
+        candidate_ids = [row[0] for row in db.session.query(OutboundEmail.id).filter(
+            OutboundEmail.status == from_status,
+            OutboundEmail.next_attempt_at <= now
+        ).order_by(OutboundEmail.id).limit(limit).all()]
+
+        claimed = []
+        for outbound_id in candidate_ids:
+            updated = OutboundEmail.query.filter_by(id=outbound_id, status=from_status).update(
+                {'status': 'sending', 'next_attempt_at': now},
+                synchronize_session=False
+            )
+            if updated:
+                claimed.append(outbound_id)
+        db.session.commit()
+
+        if not claimed:
+            return []
+        return OutboundEmail.query.filter(OutboundEmail.id.in_(claimed)).order_by(OutboundEmail.id).all()
+
+    def process_batch(self, limit=None):
+        """Claim and send one batch of due messages over a single SMTP session"""
+        digested = self.send_digest()
+        batch = self._claim(limit or self.app.config['EMAIL_QUEUE_BATCH_SIZE'])
+        if not batch:
+            return digested
+        try:
+            with smtp_pool.connection() as connection:
+                for outbound in batch:
+                    self._deliver(outbound, connection)
+        except Exception as e:
+            # Could not reach the relay at all; give every unsent row back
+            for outbound in batch:
+                if outbound.status == 'sending':
+                    outbound.attempts = (outbound.attempts or 0) + 1
+                    self._mark_failed(outbound, e)
+        db.session.commit()
+        return digested + len(batch)
+
+    def _deliver(self, outbound, connection):
+        outbound.attempts = (outbound.attempts or 0) + 1
+        try:
+            submission = db.session.get(KIND_MODELS[outbound.kind], outbound.submission_id)
+            if submission is None:
+                raise LookupError(f"{outbound.kind} submission {outbound.submission_id} no longer exists")
+            self.email_service.send_message(outbound.kind, submission, outbound.recipient, connection)
+        except Exception as e:
+            self._mark_failed(outbound, e)
+        else:
+            outbound.status = 'sent'
+            outbound.sent_at = datetime.utcnow()
+            outbound.last_error = None
+
+    def _mark_failed(self, outbound, error, retry_status='pending'):
+        outbound.last_error = str(error)[:1000]
+        if outbound.attempts >= self.app.config['EMAIL_QUEUE_MAX_ATTEMPTS']:
+            outbound.status = 'failed'
+        else:
+            # Linear backoff keeps a flapping relay from being hammered
+            delay = self.app.config['EMAIL_QUEUE_RETRY_DELAY'] * outbound.attempts
+            outbound.status = retry_status
+            outbound.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+        self.app.logger.error(f"Failed to send {outbound.kind} email {outbound.id}: {outbound.last_error}")
+
+    def send_digest(self, force=False):
+        """Send one admin digest if the window elapsed or the threshold is reached"""
+        config = self.app.config
+        now = datetime.utcnow()
+        held = db.session.query(
+            db.func.count(OutboundEmail.id),
+            db.func.min(OutboundEmail.created_at)
+        ).filter(
+            OutboundEmail.status == 'digest',
+            OutboundEmail.next_attempt_at <= now
+        ).one()
+        count, oldest = held
+        if not count:
+            return 0
+        window_elapsed = oldest is not None and oldest <= now - timedelta(seconds=config['ADMIN_DIGEST_INTERVAL'])
+        if not (force or window_elapsed or count >= config['ADMIN_DIGEST_MAX_ITEMS']):
+            return 0
+
+        batch = self._claim(DIGEST_ITEM_LIMIT, from_status='digest')
+        if not batch:
+            return 0
+
+        prayer_ids = [o.submission_id for o in batch if o.kind == 'prayer_admin']
+        contact_ids = [o.submission_id for o in batch if o.kind == 'contact_admin']
+        prayer_requests = PrayerRequest.query.filter(PrayerRequest.id.in_(prayer_ids)).order_by(
+            PrayerRequest.id
+        ).all() if prayer_ids else []
+        contact_submissions = ContactSubmission.query.filter(ContactSubmission.id.in_(contact_ids)).order_by(
+            ContactSubmission.id
+        ).all() if contact_ids else []
+
+        for outbound in batch:
+            outbound.attempts = (outbound.attempts or 0) + 1
+        try:
+            self.email_service.send_admin_digest(prayer_requests, contact_submissions)
+        except Exception as e:
+            for outbound in batch:
+                self._mark_failed(outbound, e, retry_status='digest')
+        else:
+            sent_at = datetime.utcnow()
+            for outbound in batch:
+                outbound.status = 'sent'
+                outbound.sent_at = sent_at
+                outbound.last_error = None
+        db.session.commit()
+        return len(batch)
+
+    def requeue_stale(self):
+        """Return rows stuck in 'sending' (e.g. a crashed worker) to the queue"""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.app.config['EMAIL_QUEUE_STALE_AFTER'])
+        stale = OutboundEmail.query.filter(
+            OutboundEmail.status == 'sending',
+            OutboundEmail.next_attempt_at < cutoff
+        )
+        if self.app.config['ADMIN_DIGEST_ENABLED']:
+            stale.filter(OutboundEmail.kind.in_(ADMIN_KINDS)).update(
+                {'status': 'digest'}, synchronize_session=False
+            )
+        stale.update({'status': 'pending'}, synchronize_session=False)
+        db.session.commit()
+
+    def prune_batch(self, cutoff, limit):
+        """Delete up to ``limit`` sent or failed rows created before ``cutoff``"""
+        ids = db.session.execute(
+            db.select(OutboundEmail.id)
+            .where(OutboundEmail.status.in_(('sent', 'failed')), OutboundEmail.created_at < cutoff)
+            .order_by(OutboundEmail.id)
+            .limit(limit)
+        ).scalars().all()
+        if ids:
+            db.session.execute(db.delete(OutboundEmail).where(OutboundEmail.id.in_(ids)))
+        db.session.commit()
+        return len(ids)
+
+    # -- reporting -----------------------------------------------------
+
+    def status_counts(self):
+        """Number of queued messages per status"""
+        counts = dict.fromkeys(QUEUE_STATUSES, 0)
+        rows = db.session.query(OutboundEmail.status, db.func.count(OutboundEmail.id)).group_by(
+            OutboundEmail.status
+        ).all()
+        counts.update({status: count for status, count in rows})
+        return counts
+
+
+email_queue = EmailQueue()
+
+
+def _run_worker_process():
+    from src.main import app
+    from src.db_config import prepare_database
+    with app.app_context():
+        prepare_database(app, db)
+    queue = app.extensions['email_queue']
+    queue.app.config['EMAIL_QUEUE_MODE'] = 'thread'
+    queue.start()
+    try:
+        for thread in queue._threads:
+            thread.join()
+    except KeyboardInterrupt:
+        queue.stop(timeout=30)
+
+
+if __name__ == '__main__':
+    import argparse
+    import multiprocessing
+
+    parser = argparse.ArgumentParser(description='Drain the outbound email queue')
+    parser.add_argument('--processes', type=int, default=1, help='number of worker processes')
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        _run_worker_process()
+    else:
+        workers = [multiprocessing.Process(target=_run_worker_process) for _ in range(args.processes)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
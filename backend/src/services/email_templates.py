@@ -0,0 +1,322 @@
+import os
+import stat
+import threading
+import time
+from datetime import datetime
+from jinja2 import Environment, DictLoader, FileSystemBytecodeCache
+from src.services.metrics import metrics
+
+# Static chunks shared by every email. They are joined into the template
+# sources once at import, so the compiled templates emit them as single
+# constant strings and a render is mostly variable substitution.
+_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+"""
+
+_BODY_OPEN = """    </style>
+</head>
+<body>
+    <div class="container">
+"""
+
+_FOOT = """    </div>
+</body>
+</html>
+"""
+
+_PRAYER_GRADIENT = "linear-gradient(135deg, #667eea 0%, #764ba2 100%)"
+_CONTACT_GRADIENT = "linear-gradient(135deg, #20b2aa 0%, #2e8b57 100%)"
+
+
+def _admin_styles(gradient, accent):
+    return f"""        .header {{ background: {gradient}; color: white; padding: 20px; border-radius: 8px 8px 0 0; }}
+        .content {{ background: #f9f9f9; padding: 20px; border-radius: 0 0 8px 8px; }}
+        .field {{ margin-bottom: 15px; }}
+        .label {{ font-weight: bold; color: #555; }}
+        .value {{ margin-top: 5px; padding: 10px; background: white; border-radius: 4px; border-left: 4px solid {accent}; }}
+"""
+
+
+def _confirmation_styles(gradient, accent):
+    return f"""        .header {{ background: {gradient}; color: white; padding: 20px; border-radius: 8px 8px 0 0; text-align: center; }}
+        .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 8px 8px; }}
+        .message {{ background: white; padding: 20px; border-radius: 8px; border-left: 4px solid {accent}; }}
+        .footer {{ margin-top: 20px; padding-top: 20px; border-top: 1px solid #ddd; font-size: 14px; color: #666; }}
+"""
+
+
+def _page(styles, body):
+    return _HEAD + styles + _BODY_OPEN + body + _FOOT
+
+
+_PRAYER_ADMIN_BODY = """        <div class="header">
+            <h2>New Prayer Request Received</h2>
+            <p>{{ datetime.now().strftime('%B %d, %Y at %I:%M %p') }}</p>
+        </div>
+        <div class="content">
+            {% if prayer_request.is_anonymous %}
+            <div class="field">
+                <div class="label">Submission Type:</div>
+                <div class="value anonymous">Anonymous Request</div>
+            </div>
+            {% else %}
+            <div class="field">
+                <div class="label">Name:</div>
+                <div class="value">{{ prayer_request.name }}</div>
+            </div>
+            <div class="field">
+                <div class="label">Email:</div>
+                <div class="value">{{ prayer_request.email }}</div>
+            </div>
+            {% endif %}
+
+            <div class="field">
+                <div class="label">Category:</div>
+                <div class="value">{{ prayer_request.category.title() }}</div>
+            </div>
+
+            <div class="field">
+                <div class="label">Language:</div>
+                <div class="value">{{ 'English' if prayer_request.language == 'en' else 'Arabic' }}</div>
+            </div>
+
+            <div class="field">
+                <div class="label">Prayer Request:</div>
+                <div class="value">{{ prayer_request.request }}</div>
+            </div>
+
+            <div class="field">
+                <div class="label">Submitted:</div>
+                <div class="value">{{ prayer_request.created_at.strftime('%B %d, %Y at %I:%M %p UTC') }}</div>
+            </div>
+        </div>
+"""
+
+_PRAYER_CONFIRMATION_BODY = """        <div class="header">
+            <h2>Prayer Request Received</h2>
+            <p>Thank you for sharing your heart with us</p>
+        </div>
+        <div class="content">
+            <div class="message">
+                <p>Dear {{ prayer_request.name }},</p>
+
+                <p>We have received your prayer request and want you to know that you are not alone. Our community believes in the power of prayer and we are honored that you've shared your needs with us.</p>
+
+                <p><strong>Your prayer request category:</strong> {{ prayer_request.category.title() }}</p>
+
+                <p>We will be praying for you and your situation. Remember that God hears every prayer and cares deeply about what concerns you.</p>
+
+                <p><em>"Do not be anxious about anything, but in every situation, by prayer and petition, with thanksgiving, present your requests to God. And the peace of God, which transcends all understanding, will guard your hearts and your minds in Christ Jesus." - Philippians 4:6-7</em></p>
+
+                <p>If you need immediate support or have additional prayer requests, please don't hesitate to reach out to us.</p>
+
+                <p>Blessings and peace,<br>
+                The ChatAT Community</p>
+            </div>
+
+            <div class="footer">
+                <p>This is an automated confirmation. If you have questions, please contact us through our website.</p>
+                <p>Submitted on {{ prayer_request.created_at.strftime('%B %d, %Y at %I:%M %p UTC') }}</p>
+            </div>
+        </div>
+"""
+
+_CONTACT_ADMIN_BODY = """        <div class="header">
+            <h2>New Contact Message</h2>
+            <p>{{ datetime.now().strftime('%B %d, %Y at %I:%M %p') }}</p>
+        </div>
+        <div class="content">
+            <div class="field">
+                <div class="label">Name:</div>
+                <div class="value">{{ contact_submission.name }}</div>
+            </div>
+
+            <div class="field">
+                <div class="label">Email:</div>
+                <div class="value">{{ contact_submission.email }}</div>
+            </div>
+
+            <div class="field">
+                <div class="label">Subject:</div>
+                <div class="value">{{ contact_submission.subject }}</div>
+            </div>
+
+            <div class="field">
+                <div class="label">Language:</div>
+                <div class="value">{{ 'English' if contact_submission.language == 'en' else 'Arabic' }}</div>
+            </div>
+
+            <div class="field">
+                <div class="label">Message:</div>
+                <div class="value">{{ contact_submission.message }}</div>
+            </div>
+
+            <div class="field">
+                <div class="label">Submitted:</div>
+                <div class="value">{{ contact_submission.created_at.strftime('%B %d, %Y at %I:%M %p UTC') }}</div>
+            </div>
+        </div>
+"""
+
+_CONTACT_CONFIRMATION_BODY = """        <div class="header">
+            <h2>Message Received</h2>
+            <p>Thank you for reaching out to us</p>
+        </div>
+        <div class="content">
+            <div class="message">
+                <p>Dear {{ contact_submission.name }},</p>
+
+                <p>Thank you for contacting ChatAT. We have received your message and appreciate you taking the time to reach out to us.</p>
+
+                <p><strong>Your message subject:</strong> {{ contact_submission.subject }}</p>
+
+                <p>We typically respond to messages within 24 hours during business days. If your inquiry is urgent, please don't hesitate to follow up with us.</p>
+
+                <p>We value your connection with our community and look forward to assisting you.</p>
+
+                <p>Blessings,<br>
+                The ChatAT Team</p>
+            </div>
+
+            <div class="footer">
+                <p>This is an automated confirmation. We will respond to your message soon.</p>
+                <p>Submitted on {{ contact_submission.created_at.strftime('%B %d, %Y at %I:%M %p UTC') }}</p>
+            </div>
+        </div>
+"""
+
+_ADMIN_DIGEST_BODY = """        <div class="header">
+            <h2>Submissions Digest</h2>
+            <p>{{ prayer_requests|length }} prayer request(s), {{ contact_submissions|length }} contact message(s) &middot; {{ datetime.now().strftime('%B %d, %Y at %I:%M %p') }}</p>
+        </div>
+        <div class="content">
+            {% if prayer_requests %}
+            <h3>Prayer Requests</h3>
+            {% for prayer_request in prayer_requests %}
+            <div class="item prayer">
+                <div class="meta">
+                    #{{ prayer_request.id }} &middot; {{ prayer_request.category.title() }} &middot; {{ 'English' if prayer_request.language == 'en' else 'Arabic' }} &middot; {{ prayer_request.created_at.strftime('%B %d, %Y at %I:%M %p UTC') }}
+                </div>
+                {% if prayer_request.is_anonymous %}
+                <div class="anonymous">Anonymous Request</div>
+                {% else %}
+                <div class="label">{{ prayer_request.name }} &lt;{{ prayer_request.email }}&gt;</div>
+                {% endif %}
+                <div class="value">{{ prayer_request.request }}</div>
+            </div>
+            {% endfor %}
+            {% endif %}
+
+            {% if contact_submissions %}
+            <h3>Contact Messages</h3>
+            {% for contact_submission in contact_submissions %}
+            <div class="item contact">
+                <div class="meta">
+                    #{{ contact_submission.id }} &middot; {{ 'English' if contact_submission.language == 'en' else 'Arabic' }} &middot; {{ contact_submission.created_at.strftime('%B %d, %Y at %I:%M %p UTC') }}
+                </div>
+                <div class="label">{{ contact_submission.name }} &lt;{{ contact_submission.email }}&gt; &mdash; {{ contact_submission.subject }}</div>
+                <div class="value">{{ contact_submission.message }}</div>
+            </div>
+            {% endfor %}
+            {% endif %}
+        </div>
+"""
+
+TEMPLATE_SOURCES = {
+    'prayer_admin.html': _page(
+        _admin_styles(_PRAYER_GRADIENT, '#667eea')
+        + "        .anonymous { color: #e74c3c; font-style: italic; }\n",
+        _PRAYER_ADMIN_BODY
+    ),
+    'prayer_confirmation.html': _page(
+        _confirmation_styles(_PRAYER_GRADIENT, '#667eea'),
+        _PRAYER_CONFIRMATION_BODY
+    ),
+    'contact_admin.html': _page(
+        _admin_styles(_CONTACT_GRADIENT, '#20b2aa'),
+        _CONTACT_ADMIN_BODY
+    ),
+    'contact_confirmation.html': _page(
+        _confirmation_styles(_CONTACT_GRADIENT, '#20b2aa'),
+        _CONTACT_CONFIRMATION_BODY
+    ),
+    'admin_digest.html': _page(
+        _admin_styles(_PRAYER_GRADIENT, '#667eea')
+        + "        .item { margin-bottom: 20px; padding-bottom: 15px; border-bottom: 1px solid #ddd; }\n"
+        + "        .item.contact .value { border-left-color: #20b2aa; }\n"
+        + "        .meta { font-size: 13px; color: #888; }\n"
+        + "        .anonymous { color: #e74c3c; font-style: italic; }\n",
+        _ADMIN_DIGEST_BODY
+    ),
+}
+
+_environment = None
+_environment_lock = threading.Lock()
+
+
+def _cache_directory():
+    """Bytecode cache directory override, or None for Jinja's per-user default.
+
+    Cached bytecode is executed on load, so the directory must be private:
+    it is created with mode 0700 and refused if another user owns it or
+    can write to it.
+    """
+    cache_dir = os.getenv('EMAIL_TEMPLATE_CACHE_DIR')
+    if not cache_dir:
+        return None
+    os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    info = os.lstat(cache_dir)
+    if not stat.S_ISDIR(info.st_mode):
+        raise RuntimeError(f'EMAIL_TEMPLATE_CACHE_DIR {cache_dir} is not a directory')
+    if hasattr(os, 'getuid') and (info.st_uid != os.getuid() or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)):
+        raise RuntimeError(
+            f'EMAIL_TEMPLATE_CACHE_DIR {cache_dir} must be owned by this user and not group/world writable'
+        )
+    return cache_dir
+
+
+def get_environment():
+    """Shared Jinja environment, created on first use.
+
+    Compiled templates are kept in the environment's cache for the life of
+    the process and their bytecode is written to ``EMAIL_TEMPLATE_CACHE_DIR``
+    (default: Jinja's per-user temp directory) so new processes skip the
+    lex/parse/compile step as well.
+    """
+    global _environment
+    if _environment is None:
+        with _environment_lock:
+            if _environment is None:
+                environment = Environment(
+                    loader=DictLoader(TEMPLATE_SOURCES),
+                    bytecode_cache=FileSystemBytecodeCache(_cache_directory()),
+                    auto_reload=False,
+                    cache_size=-1
+                )
+                environment.globals['datetime'] = datetime
+                _environment = environment
+    return _environment
+
+
+def render(name, **context):
+    """Render a precompiled email template by name"""
+    template = get_environment().get_template(name)
+    if not metrics.enabled:
+        return template.render(**context)
+    start = time.perf_counter()
+    try:
+        return template.render(**context)
+    finally:
+        metrics.render_latency.observe(time.perf_counter() - start, (('template', name),))
+
+
+def precompile():
+    """Compile every email template up front (e.g. before forking workers)"""
+    environment = get_environment()
+    for name in TEMPLATE_SOURCES:
+        environment.get_template(name)
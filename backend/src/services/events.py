@@ -0,0 +1,279 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+from src.models.user import db
+from src.models.forms import PrayerRequest, ContactSubmission
+from src.services.json_provider import dumps
+from src.services.serializers import FIELDS, projection
+
+# SSE event name for each streamed table, in Last-Event-ID order
+EVENT_MODELS = (
+    ('prayer_request', PrayerRequest),
+    ('contact_submission', ContactSubmission),
+)
+
+# Rows fetched per table per poll; more are picked up on the next poll
+POLL_LIMIT = 500
+
+
+def format_event_id(marks):
+    """Last-Event-ID: the id below which each table was fully sent, e.g. ``42-7``"""
+    return '-'.join(str(mark) for mark in marks)
+
+
+def parse_event_id(value):
+    """Inverse of format_event_id; raises ValueError on malformed input"""
+    marks = tuple(int(part) for part in value.split('-'))
+    if len(marks) != len(EVENT_MODELS) or min(marks) < 0:
+        raise ValueError('Invalid Last-Event-ID')
+    return marks
+
+
+class Listener:
+    """One connected stream: a bounded queue of formatted events"""
+
+    def __init__(self, size):
+        self.queue = queue.Queue(size)
+        self.overflowed = False
+
+    def put(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            # Too slow to keep up: end its stream, the client resumes by id
+            self.overflowed = True
+
+
+class EventBroker:
+    """Fans newly committed submissions out to every SSE listener of the process.
+
+    A single poller thread, running only while someone listens, selects
+    rows with ids above its high-water marks every ``EVENTS_POLL_INTERVAL``
+    seconds (immediately after an in-process submission via ``notify()``),
+    serializes each row once and hands the formatted event to all
+    listeners. Database load therefore does not grow with the number of
+    open dashboards, and rows committed by other processes show up too.
+
+    On SQLite ids are committed in order (one writer). Elsewhere a lower id
+    can commit after a higher one, so ids skipped over are remembered as
+    gaps and polled for again until they show up or ``EVENTS_GAP_TIMEOUT``
+    seconds pass (rolled back). Event ids are low-water marks, below every
+    open gap: a resumed stream never misses a row but may repeat a few.
+
+    The last ``EVENTS_BUFFER_SIZE`` events are kept for ``Last-Event-ID``
+    resumes; older resume points are answered with one catch-up query.
+    Every open stream holds a server thread, so at most
+    ``SERVER_THREADS - EVENTS_THREAD_HEADROOM`` streams are served when the
+    server's thread count is known (gunicorn, ASGI), and never more than
+    ``EVENTS_MAX_LISTENERS``.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._listeners = set()
+        self._buffer = deque()
+        self._buffer_start = None
+        self._marks = None
+        self._high = None
+        self._gaps = None
+        self._gap_timeout = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._poller = None
+        self._serializers = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('EVENTS_POLL_INTERVAL', float(os.getenv('EVENTS_POLL_INTERVAL', 2)))
+        app.config.setdefault('EVENTS_HEARTBEAT', float(os.getenv('EVENTS_HEARTBEAT', 15)))
+        app.config.setdefault('EVENTS_BUFFER_SIZE', int(os.getenv('EVENTS_BUFFER_SIZE', 1000)))
+        app.config.setdefault('EVENTS_MAX_LISTENERS', int(os.getenv('EVENTS_MAX_LISTENERS', 100)))
+        app.config.setdefault('EVENTS_THREAD_HEADROOM', int(os.getenv('EVENTS_THREAD_HEADROOM', 2)))
+        app.config.setdefault('EVENTS_LISTENER_QUEUE', int(os.getenv('EVENTS_LISTENER_QUEUE', 1000)))
+        app.config.setdefault('EVENTS_GAP_TIMEOUT', float(os.getenv('EVENTS_GAP_TIMEOUT', 30)))
+        # Request threads per process, set by the gunicorn config and ASGI entry point
+        app.config.setdefault('SERVER_THREADS', None)
+        self.app = app
+        app.extensions['events'] = self
+
+    @property
+    def listener_count(self):
+        return len(self._listeners)
+
+    @property
+    def max_listeners(self):
+        """Streams this process may hold without starving other requests"""
+        config = self.app.config
+        limit = config['EVENTS_MAX_LISTENERS']
+        if config['SERVER_THREADS']:
+            limit = min(limit, config['SERVER_THREADS'] - config['EVENTS_THREAD_HEADROOM'])
+        return max(0, limit)
+
+    def notify(self):
+        """Signal that new rows were committed"""
+        if self._listeners:
+            self._wakeup.set()
+
+    def _projection(self, model):
+        if model not in self._serializers:
+            self._serializers[model] = projection(model, list(FIELDS[model]))
+        return self._serializers[model]
+
+    @staticmethod
+    def _format(marks, name, data):
+        return f'id: {format_event_id(marks)}\nevent: {name}\ndata: {dumps(data)}\n\n'
+
+    def _current_marks(self):
+        return tuple(
+            db.session.execute(db.select(db.func.coalesce(db.func.max(model.id), 0))).scalar()
+            for _, model in EVENT_MODELS
+        )
+
+    def _poll(self):
+        """New rows and filled gaps as ``(table index, row id, message)``, oldest id first.
+
+        Returns the events with the advanced ``(marks, high, gaps)``; the
+        caller stores them only once every query succeeded.
+        """
+        now = time.monotonic()
+        events = []
+        marks, highs = list(self._marks), list(self._high)
+        all_gaps = [dict(table_gaps) for table_gaps in self._gaps]
+        for index, (name, model) in enumerate(EVENT_MODELS):
+            high, gaps = highs[index], all_gaps[index]
+            for gap in [gap for gap, seen in gaps.items() if now - seen >= self._gap_timeout]:
+                del gaps[gap]
+            columns, serialize = self._projection(model)
+            condition = model.id > high
+            if gaps:
+                condition = db.or_(condition, model.id.in_(list(gaps)))
+            rows = db.session.execute(
+                db.select(*columns).where(condition).order_by(model.id).limit(POLL_LIMIT)
+            ).all()
+            for row in rows:
+                if row.id > high:
+                    if self._gap_timeout:
+                        for missing in range(max(high + 1, row.id - POLL_LIMIT), row.id):
+                            gaps[missing] = now
+                    high = row.id
+                gaps.pop(row.id, None)
+                marks[index] = min(gaps) - 1 if gaps else high
+                events.append((index, row.id, self._format(marks, name, serialize(row))))
+            highs[index] = high
+            marks[index] = min(gaps) - 1 if gaps else high
+        return events, (tuple(marks), highs, all_gaps)
+
+    def _poll_loop(self):
+        config = self.app.config
+        with self.app.app_context():
+            while True:
+                self._wakeup.wait(config['EVENTS_POLL_INTERVAL'])
+                self._wakeup.clear()
+                with self._lock:
+                    if not self._listeners:
+                        self._poller = None
+                        return
+                    try:
+                        events, (self._marks, self._high, self._gaps) = self._poll()
+                    except Exception:
+                        self.app.logger.exception('Event poller query failed')
+                        continue
+                    finally:
+                        db.session.remove()
+                    self._buffer.extend(events)
+                    while len(self._buffer) > config['EVENTS_BUFFER_SIZE']:
+                        index, row_id, _ = self._buffer.popleft()
+                        start = list(self._buffer_start)
+                        start[index] = max(start[index], row_id)
+                        self._buffer_start = tuple(start)
+                    listeners = list(self._listeners)
+                for _, _, message in events:
+                    for listener in listeners:
+                        listener.put(message)
+
+    def _catch_up(self, resume, high, gaps, marks, limit):
+        """Rows above ``resume`` the poller already passed (up to ``high``, outside ``gaps``)"""
+        messages = []
+        progress = list(resume)
+        for index, (name, model) in enumerate(EVENT_MODELS):
+            columns, serialize = self._projection(model)
+            query = db.select(*columns).where(model.id > resume[index], model.id <= high[index])
+            if gaps[index]:
+                query = query.where(model.id.not_in(list(gaps[index])))
+            rows = db.session.execute(query.order_by(model.id).limit(limit)).all()
+            for row in rows:
+                progress[index] = max(progress[index], min(row.id, marks[index]))
+                messages.append(self._format(progress, name, serialize(row)))
+            if len(rows) < limit:
+                # The whole table was caught up
+                progress[index] = max(progress[index], marks[index])
+        return messages
+
+    def subscribe(self, last_event_id=None):
+        """Register a listener; returns ``(listener, backlog)`` or None when full.
+
+        ``backlog`` holds the formatted events after ``last_event_id`` that
+        the listener missed. Raises ValueError for a malformed id. The
+        caller must ``unsubscribe`` once the stream ends, even if it never
+        starts; ``stream()`` does so when it runs.
+        """
+        resume = parse_event_id(last_event_id) if last_event_id else None
+        config = self.app.config
+        listener = Listener(config['EVENTS_LISTENER_QUEUE'])
+        with self._lock:
+            if len(self._listeners) >= self.max_listeners:
+                return None
+            if self._poller is None:
+                # High-water marks restart from the current state
+                self._marks = self._buffer_start = self._current_marks()
+                self._high = list(self._marks)
+                self._gaps = [{} for _ in EVENT_MODELS]
+                # SQLite commits ids in order, so nothing is ever skipped over
+                self._gap_timeout = 0 if db.engine.dialect.name == 'sqlite' else config['EVENTS_GAP_TIMEOUT']
+                self._buffer.clear()
+                self._poller = threading.Thread(target=self._poll_loop, name='event-poller', daemon=True)
+                self._poller.start()
+            self._listeners.add(listener)
+            marks = self._marks
+            high = tuple(self._high)
+            gaps = [dict(table_gaps) for table_gaps in self._gaps]
+            start = self._buffer_start
+            buffered = list(self._buffer)
+
+        if resume is None:
+            return listener, []
+        if all(seen >= mark for seen, mark in zip(resume, start)):
+            # Everything after the resume point is still buffered
+            return listener, [message for index, row_id, message in buffered if row_id > resume[index]]
+        # Too old for the buffer: one catch-up query up to the live marks
+        try:
+            return listener, self._catch_up(resume, high, gaps, marks, config['EVENTS_BUFFER_SIZE'])
+        except Exception:
+            self.unsubscribe(listener)
+            raise
+
+    def unsubscribe(self, listener):
+        with self._lock:
+            self._listeners.discard(listener)
+        self._wakeup.set()
+
+    def stream(self, listener, backlog):
+        """SSE body for ``listener``: backlog, live events and heartbeats"""
+        heartbeat = self.app.config['EVENTS_HEARTBEAT']
+        try:
+            yield f'retry: {int(self.app.config["EVENTS_POLL_INTERVAL"] * 1000) + 1000}\n\n'
+            for message in backlog:
+                yield message
+            while not listener.overflowed:
+                try:
+                    yield listener.queue.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ': keepalive\n\n'
+        finally:
+            self.unsubscribe(listener)
+
+
+event_broker = EventBroker()
@@ -0,0 +1,61 @@
+import csv
+import io
+from src.services.json_provider import dumps
+from src.services.pagination import decode_cursor, encode_cursor, keyset_page
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+EXPORT_CHUNK_SIZE = 1000
+
+
+def iter_chunks(query, model, serialize, cursor=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield lists of row dicts, newest first, one keyset page at a time.
+
+    ``query`` selects a column projection (see ``serializers.projection``)
+    and ``serialize`` turns each result tuple into a dict, so no ORM objects
+    are built. Each chunk is its own short query seeking on (created_at, id)
+    and the query's session transaction is ended after it, so no read
+    transaction stays open for the whole export. Every row
+    carries the ``cursor`` that resumes the export right after it.
+    """
+    if cursor:
+        decode_cursor(cursor)
+    while True:
+        items, next_cursor = keyset_page(query, model, cursor, chunk_size)
+        # Read-only: release the snapshot before the chunk is streamed out
+        query.session.rollback()
+        rows = []
+        for item in items:
+            row = serialize(item)
+            row['cursor'] = encode_cursor(item.created_at, item.id)
+            rows.append(row)
+        if rows:
+            yield rows
+        if next_cursor is None:
+            return
+        cursor = next_cursor
+
+
+def ndjson_stream(chunks):
+    for rows in chunks:
+        yield ''.join(dumps(row) + '\n' for row in rows)
+
+
+def csv_stream(chunks, columns):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction='ignore')
+    writer.writeheader()
+    yield buffer.getvalue()
+    for rows in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue()
+
+
+def export_columns(fields):
+    """CSV header: the exported fields plus the resume cursor"""
+    return list(fields) + ['cursor']
@@ -0,0 +1,126 @@
+import os
+import smtplib
+import threading
+import time
+from datetime import datetime
+from src.models.user import db
+from src.models.forms import PrayerRequest
+from src.db_config import prepare_database
+
+
+class HealthChecker:
+    """Readiness probes for the database and the SMTP relay, cached.
+
+    ``status()`` never runs a probe itself: it returns the last results and,
+    when they are older than ``HEALTH_CHECK_INTERVAL`` seconds, starts one
+    background refresh (at most one at a time per process). Load balancer
+    polls therefore cost a dict copy, and the mail relay sees at most one
+    connection per ``HEALTH_SMTP_INTERVAL``. Only the very first call waits,
+    up to ``HEALTH_CHECK_TIMEOUT`` seconds, for an initial result.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._results = {}
+        self._checked_at = None
+        self._smtp_checked_at = None
+        self._refreshing = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('HEALTH_CHECK_INTERVAL', float(os.getenv('HEALTH_CHECK_INTERVAL', 10)))
+        app.config.setdefault('HEALTH_SMTP_INTERVAL', float(os.getenv('HEALTH_SMTP_INTERVAL', 60)))
+        app.config.setdefault('HEALTH_CHECK_TIMEOUT', float(os.getenv('HEALTH_CHECK_TIMEOUT', 3)))
+        app.config.setdefault('HEALTH_REQUIRE_SMTP', os.getenv('HEALTH_REQUIRE_SMTP', 'False').lower() == 'true')
+        self.app = app
+        app.extensions['health'] = self
+
+    def _probe_database(self):
+        start = time.perf_counter()
+        try:
+            # Health endpoints skip the first-request schema setup, so a fresh
+            # deploy becomes ready once the probe has done it here
+            prepare_database(self.app, db)
+            # Reads a real table, so a locked or missing SQLite file fails here
+            db.session.execute(db.select(PrayerRequest.id).limit(1)).all()
+            return {'status': 'ok', 'latency_ms': round((time.perf_counter() - start) * 1000, 2)}
+        except Exception as e:
+            return {'status': 'error', 'error': str(e).splitlines()[0]}
+        finally:
+            db.session.remove()
+
+    def _probe_smtp(self):
+        config = self.app.config
+        if config.get('MAIL_SUPPRESS_SEND') or not config.get('MAIL_SERVER'):
+            return {'status': 'skipped'}
+        start = time.perf_counter()
+        smtp_class = smtplib.SMTP_SSL if config.get('MAIL_USE_SSL') else smtplib.SMTP
+        try:
+            # Connect and greet only; no login, so the relay sees a cheap session
+            host = smtp_class(config['MAIL_SERVER'], config['MAIL_PORT'], timeout=config['HEALTH_CHECK_TIMEOUT'])
+            try:
+                code, _ = host.noop()
+            finally:
+                try:
+                    host.quit()
+                except (smtplib.SMTPException, OSError):
+                    host.close()
+            if code != 250:
+                return {'status': 'error', 'error': f'NOOP returned {code}'}
+            return {'status': 'ok', 'latency_ms': round((time.perf_counter() - start) * 1000, 2)}
+        except (smtplib.SMTPException, OSError) as e:
+            return {'status': 'error', 'error': str(e) or e.__class__.__name__}
+
+    def refresh(self):
+        """Run the probes now (SMTP only when its own interval has passed)"""
+        with self.app.app_context():
+            results = {'database': self._probe_database()}
+        now = time.monotonic()
+        smtp_due = (
+            self._smtp_checked_at is None
+            or now - self._smtp_checked_at >= self.app.config['HEALTH_SMTP_INTERVAL']
+        )
+        if smtp_due:
+            results['smtp'] = self._probe_smtp()
+            self._smtp_checked_at = now
+        with self._lock:
+            self._results = {**self._results, **results}
+            self._checked_at = now
+            self._refreshing = None
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing is not None and self._refreshing.is_alive():
+                return self._refreshing
+            self._refreshing = threading.Thread(target=self.refresh, name='health-probe', daemon=True)
+            self._refreshing.start()
+            return self._refreshing
+
+    def status(self):
+        """``(ready, report)`` from the cached probe results"""
+        with self._lock:
+            checked_at = self._checked_at
+        if checked_at is None:
+            self._refresh_in_background().join(self.app.config['HEALTH_CHECK_TIMEOUT'])
+        elif time.monotonic() - checked_at >= self.app.config['HEALTH_CHECK_INTERVAL']:
+            self._refresh_in_background()
+
+        with self._lock:
+            checks = dict(self._results)
+            checked_at = self._checked_at
+        required = ['database'] + (['smtp'] if self.app.config['HEALTH_REQUIRE_SMTP'] else [])
+        ready = checked_at is not None and all(
+            checks.get(name, {}).get('status') in ('ok', 'skipped') for name in required
+        )
+        healthy = all(check.get('status') in ('ok', 'skipped') for check in checks.values())
+        return ready, {
+            'status': 'healthy' if healthy and ready else ('degraded' if ready else 'unavailable'),
+            'checks': checks,
+            'checked_seconds_ago': round(time.monotonic() - checked_at, 1) if checked_at is not None else None,
+            'timestamp': datetime.utcnow().isoformat()
+        }
+
+
+health_checker = HealthChecker()
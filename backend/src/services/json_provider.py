@@ -0,0 +1,63 @@
+import json
+from datetime import date
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional; the standard library encoder is used instead
+    orjson = None
+
+
+def _default(o):
+    # Dates as ISO 8601, matching what orjson emits natively
+    if isinstance(o, date):
+        return o.isoformat()
+    return DefaultJSONProvider.default(o)
+
+
+def dumps_bytes(obj, sort_keys=False, indent=False):
+    """Serialize ``obj`` to UTF-8 JSON bytes, with orjson when installed"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+    return json.dumps(
+        obj, default=_default, ensure_ascii=False, sort_keys=sort_keys,
+        indent=2 if indent else None, separators=None if indent else (',', ':')
+    ).encode('utf-8')
+
+
+def dumps(obj, sort_keys=False):
+    """Like ``dumps_bytes`` but returns str"""
+    return dumps_bytes(obj, sort_keys).decode('utf-8')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, falling back to the standard library.
+
+    Output is UTF-8 rather than ASCII-escaped and datetimes are ISO 8601;
+    otherwise it follows Flask's defaults (sorted keys, indented in debug).
+    """
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # Callers asking for specific json.dumps options get exactly that
+            kwargs.setdefault('default', _default)
+            return json.dumps(obj, **kwargs)
+        return dumps_bytes(obj, self.sort_keys).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(
+            dumps_bytes(obj, self.sort_keys, indent) + b'\n',
+            mimetype=self.mimetype
+        )
@@ -0,0 +1,180 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of (label, value) pairs"""
+
+    def __init__(self, name, help, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, labels=()):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            snapshot = [(labels, list(counts), total, count) for labels, (counts, total, count) in self._series.items()]
+        for labels, counts, total, count in sorted(snapshot):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += bucket_count
+                le = bound if bound == '+Inf' else _format_value(float(bound))
+                lines.append(f'{self.name}_bucket{_format_labels(labels + (("le", le),))} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(labels)} {_format_value(total)}')
+            lines.append(f'{self.name}_count{_format_labels(labels)} {count}')
+        return lines
+
+
+class Metrics:
+    """In-process metrics exposed in the Prometheus text format on ``/metrics``.
+
+    Records per-route latency, SQL query count and time per request (from
+    SQLAlchemy cursor events), email template render time and SMTP send
+    time. Gauges such as the email queue depth are read when scraped.
+
+    With ``METRICS_ENABLED=False`` no hooks or engine events are installed
+    and the render/send timers reduce to one attribute check. Values are per
+    process; with several workers, scrape each one or aggregate upstream.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self._collectors = {}
+        self.request_latency = Histogram(
+            'http_request_duration_seconds', 'Request latency by route, method and status'
+        )
+        self.request_queries = Histogram(
+            'http_request_db_queries', 'SQL queries issued per request', QUERY_COUNT_BUCKETS
+        )
+        self.request_db_time = Histogram(
+            'http_request_db_duration_seconds', 'Time spent in SQL per request'
+        )
+        self.query_latency = Histogram('db_query_duration_seconds', 'Duration of individual SQL statements')
+        self.render_latency = Histogram('email_template_render_seconds', 'Email template render time')
+        self.smtp_latency = Histogram('smtp_send_duration_seconds', 'Time to send one email over SMTP')
+        self.histograms = (
+            self.request_latency, self.request_queries, self.request_db_time,
+            self.query_latency, self.render_latency, self.smtp_latency,
+        )
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('METRICS_ENABLED', os.getenv('METRICS_ENABLED', 'True').lower() == 'true')
+        app.extensions['metrics'] = self
+        self.enabled = app.config['METRICS_ENABLED']
+        if not self.enabled:
+            return
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        app.add_url_rule('/metrics', 'metrics', self.render_response)
+
+    def instrument_engine(self, engine):
+        """Time every statement run on ``engine``; no-op when disabled"""
+        if not self.enabled:
+            return
+
+        @event.listens_for(engine, 'before_cursor_execute')
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+        @event.listens_for(engine, 'after_cursor_execute')
+        def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info['query_start'].pop()
+            self.query_latency.observe(elapsed)
+            if has_request_context() and 'metrics_start' in g:
+                g.metrics_queries += 1
+                g.metrics_db_time += elapsed
+
+        @event.listens_for(engine, 'handle_error')
+        def _handle_error(context):
+            # Failed statements never reach after_cursor_execute
+            if context.connection is not None and context.connection.info.get('query_start'):
+                context.connection.info['query_start'].pop()
+
+    def add_collector(self, name, help, kind, collect):
+        """Register a gauge/counter read at scrape time.
+
+        ``collect`` returns a mapping of label tuples to values and runs in
+        the app context of the ``/metrics`` request.
+        """
+        self._collectors[name] = (help, kind, collect)
+
+    def _start_request(self):
+        g.metrics_start = time.perf_counter()
+        g.metrics_queries = 0
+        g.metrics_db_time = 0.0
+
+    def _finish_request(self, response):
+        start = g.pop('metrics_start', None)
+        if start is None:
+            return response
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        if route == '/metrics':
+            return response
+        self.request_latency.observe(
+            time.perf_counter() - start,
+            (('route', route), ('method', request.method), ('status', str(response.status_code)))
+        )
+        self.request_queries.observe(g.metrics_queries, (('route', route),))
+        self.request_db_time.observe(g.metrics_db_time, (('route', route),))
+        return response
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for histogram in self.histograms:
+            lines.extend(histogram.render())
+        for name, (help, kind, collect) in self._collectors.items():
+            lines.append(f'# HELP {name} {help}')
+            lines.append(f'# TYPE {name} {kind}')
+            try:
+                values = collect()
+            except Exception:
+                # One failing source should not hide the others
+                continue
+            for labels, value in sorted(values.items()):
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def render_response(self):
+        return Response(self.render(), content_type=CONTENT_TYPE)
+
+
+metrics = Metrics()
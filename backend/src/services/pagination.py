@@ -0,0 +1,77 @@
+import base64
+import threading
+import time
+from datetime import datetime
+from src.models.user import db
+
+
+def encode_cursor(created_at, row_id):
+    """Opaque cursor for the (created_at, id) position of a row"""
+    raw = f"{created_at.isoformat() if created_at else ''}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor; raises ValueError on malformed input"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8').split('|', 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (TypeError, UnicodeError, ValueError) as e:
+        raise ValueError('Invalid cursor') from e
+
+
+def newest_first(query, model):
+    """Order by (created_at, id) descending, matching the composite index"""
+    return query.order_by(model.created_at.desc(), model.id.desc())
+
+
+def keyset_page(query, model, cursor, per_page):
+    """Fetch the page after ``cursor`` using a seek on (created_at, id).
+
+    Returns ``(items, next_cursor)``; ``next_cursor`` is None on the last page.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(db.or_(
+            model.created_at < created_at,
+            db.and_(model.created_at == created_at, model.id < row_id)
+        ))
+    # Fetch one extra row to learn whether another page exists
+    rows = newest_first(query, model).limit(per_page + 1).all()
+    items = rows[:per_page]
+    next_cursor = None
+    if len(rows) > per_page:
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return items, next_cursor
+
+
+class CountCache:
+    """Short-lived cache for COUNT(*) results, dropped when rows are added"""
+
+    def __init__(self, ttl=30):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, model, query, key=None):
+        """Cached ``query.count()`` for ``model``; ``key`` identifies any filters"""
+        cache_key = (model.__tablename__, key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry and entry[1] > now:
+                return entry[0]
+        total = query.order_by(None).count()
+        with self._lock:
+            self._entries[cache_key] = (total, now + self.ttl)
+        return total
+
+    def invalidate(self, model):
+        with self._lock:
+            for cache_key in [k for k in self._entries if k[0] == model.__tablename__]:
+                del self._entries[cache_key]
+
+
+count_cache = CountCache()
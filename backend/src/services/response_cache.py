@@ -0,0 +1,195 @@
+import functools
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, request
+
+
+class MemoryBackend:
+    """Per-process LRU with a TTL on every entry"""
+
+    errors = ()
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def generation(self, namespace):
+        return self._generations.get(namespace, 0)
+
+    def bump(self, namespace):
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    def size(self):
+        return len(self._entries)
+
+
+class RedisBackend:
+    """Redis (or any RESP-compatible server) shared by every worker process"""
+
+    PREFIX = 'chatat:response-cache:'
+
+    def __init__(self, url):
+        # Optional dependency, only needed when RESPONSE_CACHE_URL is set
+        import redis
+        self.errors = (redis.RedisError,)
+        self.client = redis.Redis.from_url(url)
+        self.evictions = 0
+
+    def get(self, key):
+        value = self.client.get(self.PREFIX + key)
+        if value is None:
+            return None
+        etag, _, body = value.partition(b'\n')
+        return etag.decode('ascii'), body
+
+    def set(self, key, value, ttl):
+        etag, body = value
+        self.client.set(self.PREFIX + key, etag.encode('ascii') + b'\n' + body, ex=max(1, int(ttl)))
+
+    def generation(self, namespace):
+        return int(self.client.get(f'{self.PREFIX}gen:{namespace}') or 0)
+
+    def bump(self, namespace):
+        self.client.incr(f'{self.PREFIX}gen:{namespace}')
+
+    def size(self):
+        return None
+
+
+class ResponseCache:
+    """Caches successful JSON responses of read-heavy admin endpoints.
+
+    Entries are keyed by the table a view reads, a per-table generation and
+    the request's query arguments. ``invalidate(model)`` bumps the
+    generation, so every cached page and total for that table is dropped at
+    once without scanning keys. Responses carry an ETag and clients sending
+    a matching ``If-None-Match`` get ``304 Not Modified``.
+
+    The default backend is an in-process LRU; with several worker processes
+    each keeps its own copy and sees another worker's writes after at most
+    ``RESPONSE_CACHE_TTL`` seconds. Set ``RESPONSE_CACHE_URL`` to a Redis URL
+    to share entries and invalidations between processes (needs ``redis``).
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(('hits', 'misses', 'not_modified', 'stores', 'invalidations', 'errors'), 0)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('RESPONSE_CACHE_ENABLED', os.getenv('RESPONSE_CACHE_ENABLED', 'True').lower() == 'true')
+        app.config.setdefault('RESPONSE_CACHE_TTL', float(os.getenv('RESPONSE_CACHE_TTL', 30)))
+        app.config.setdefault('RESPONSE_CACHE_MAX_ENTRIES', int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 512)))
+        app.config.setdefault('RESPONSE_CACHE_URL', os.getenv('RESPONSE_CACHE_URL'))
+        if app.config['RESPONSE_CACHE_URL']:
+            self.backend = RedisBackend(app.config['RESPONSE_CACHE_URL'])
+        else:
+            self.backend = MemoryBackend(app.config['RESPONSE_CACHE_MAX_ENTRIES'])
+        app.extensions['response_cache'] = self
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _key(self, namespace):
+        args = '&'.join(f'{k}={v}' for k, v in sorted(request.args.items(multi=True)))
+        digest = hashlib.blake2b(f'{request.path}?{args}'.encode('utf-8'), digest_size=16).hexdigest()
+        return f'{namespace}:{self.backend.generation(namespace)}:{digest}'
+
+    def cached(self, model):
+        """Decorator caching a view's 200 responses until ``model`` changes"""
+        namespace = model.__tablename__
+
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                if not current_app.config['RESPONSE_CACHE_ENABLED']:
+                    return view(*args, **kwargs)
+                try:
+                    key = self._key(namespace)
+                    entry = self.backend.get(key)
+                except self.backend.errors:
+                    # Cache server unavailable; serve uncached
+                    self._count('errors')
+                    return view(*args, **kwargs)
+
+                if entry is not None:
+                    self._count('hits')
+                    etag, body = entry
+                    response = current_app.response_class(body, mimetype='application/json')
+                else:
+                    self._count('misses')
+                    response = current_app.make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+                    body = response.get_data()
+                    etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+                    try:
+                        self.backend.set(key, (etag, body), current_app.config['RESPONSE_CACHE_TTL'])
+                        self._count('stores')
+                    except self.backend.errors:
+                        self._count('errors')
+
+                response.set_etag(etag)
+                # Let browsers keep the body but revalidate on every poll
+                response.cache_control.private = True
+                response.cache_control.no_cache = True
+                response.make_conditional(request)
+                if response.status_code == 304:
+                    self._count('not_modified')
+                return response
+            return wrapper
+        return decorator
+
+    def invalidate(self, model):
+        """Drop every cached response for ``model``'s table"""
+        if self.backend is None:
+            return
+        try:
+            self.backend.bump(model.__tablename__)
+            self._count('invalidations')
+        except self.backend.errors:
+            self._count('errors')
+
+    def stats(self):
+        """Hit/miss counters for this process"""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else None
+        stats['evictions'] = self.backend.evictions if self.backend else 0
+        stats['entries'] = self.backend.size() if self.backend else 0
+        stats['backend'] = 'redis' if isinstance(self.backend, RedisBackend) else 'memory'
+        return stats
+
+
+response_cache = ResponseCache()
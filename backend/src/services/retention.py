@@ -0,0 +1,317 @@
+import json
+import os
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from src.models.user import db
+from src.models.forms import PrayerRequest, ContactSubmission
+from src.models.archive import ArchiveBase, ContactSubmissionArchive, PrayerRequestArchive
+from src.services.json_provider import dumps_bytes
+from src.services.search import apply_filters
+from src.services.serializers import projection
+from src.services.export import iter_chunks
+from src.services.triage import STATUS_COLUMNS
+
+ARCHIVE_MODELS = {
+    PrayerRequest: PrayerRequestArchive,
+    ContactSubmission: ContactSubmissionArchive,
+}
+
+# Replaces the text of purged anonymous prayer requests
+PURGED_TEXT = '[removed]'
+
+
+def _encode(values):
+    return zlib.compress(dumps_bytes(values))
+
+
+def _decode(payload):
+    return json.loads(zlib.decompress(payload))
+
+
+def _purge_values(values):
+    values = dict(values)
+    values['request'] = PURGED_TEXT
+    values['admin_notes'] = None
+    return values
+
+
+def _same_row(archived, live):
+    """Whether an archived payload is a copy of ``live`` (possibly purged since)"""
+    return archived == live or ('request' in live and archived == _purge_values(live))
+
+
+class Retention:
+    """Moves old handled submissions to archive tables and purges anonymous text.
+
+    Rows processed/responded and created more than ``RETENTION_ARCHIVE_DAYS``
+    ago are copied into ``*_archive`` tables (filter columns plus the whole
+    row zlib-compressed) and deleted from the live tables. The archive is in
+    the main database unless ``ARCHIVE_DATABASE_URL`` points elsewhere.
+    Anonymous prayer requests older than ``RETENTION_PURGE_ANONYMOUS_DAYS``
+    have their text replaced with ``PURGED_TEXT``, live and archived.
+
+    Work happens in batches of ``RETENTION_BATCH_SIZE`` rows, each its own
+    short transaction with ``RETENTION_BATCH_PAUSE`` seconds between them,
+    so live submissions never wait on the write lock for long. The archive
+    insert skips ids already archived with the same content, which makes
+    an interrupted batch safe to repeat; an id archived with different
+    content stops the run instead of deleting the live row. The delete
+    repeats the archive condition, so a row reopened meanwhile stays live
+    and its archive copy is dropped again. Live ids are
+    never reused (AUTOINCREMENT on SQLite, sequences elsewhere). Stats
+    counters keep counting archived rows.
+
+    The same run deletes delivered and failed outbound email rows older
+    than ``EMAIL_QUEUE_KEEP_DAYS``.
+
+    Run ``python -m src.services.retention`` from cron; 0 days disables
+    any step.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._engine = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('RETENTION_ARCHIVE_DAYS', int(os.getenv('RETENTION_ARCHIVE_DAYS', 0)))
+        app.config.setdefault('RETENTION_PURGE_ANONYMOUS_DAYS', int(os.getenv('RETENTION_PURGE_ANONYMOUS_DAYS', 0)))
+        app.config.setdefault('RETENTION_BATCH_SIZE', int(os.getenv('RETENTION_BATCH_SIZE', 500)))
+        app.config.setdefault('RETENTION_BATCH_PAUSE', float(os.getenv('RETENTION_BATCH_PAUSE', 0.1)))
+        app.config.setdefault('ARCHIVE_DATABASE_URL', os.getenv('ARCHIVE_DATABASE_URL'))
+        self.app = app
+        self._engine = None
+        app.extensions['retention'] = self
+
+    @property
+    def engine(self):
+        """Engine holding the archive tables, created (with the tables) on first use"""
+        with self._lock:
+            if self._engine is None:
+                url = self.app.config['ARCHIVE_DATABASE_URL']
+                if url:
+                    from src.db_config import configure_engine
+                    engine = create_engine(url)
+                    configure_engine(engine, self.app.config)
+                else:
+                    engine = db.engine
+                ArchiveBase.metadata.create_all(engine)
+                self._engine = engine
+            return self._engine
+
+    def session(self):
+        return Session(self.engine)
+
+    def _insert_archive(self, archive_model, rows):
+        """Insert archive rows; ids already archived must hold the same row.
+
+        A repeated batch finds its own copies and goes on. An archived id
+        holding a different row means ids were reused: raises RuntimeError
+        before anything is deleted from the live table.
+        """
+        engine = self.engine
+        with engine.begin() as conn:
+            existing = dict(conn.execute(
+                db.select(archive_model.id, archive_model.payload)
+                .where(archive_model.id.in_([row['id'] for row in rows]))
+            ).all())
+            conflicts = [
+                row['id'] for row in rows
+                if row['id'] in existing and not _same_row(_decode(existing[row['id']]), _decode(row['payload']))
+            ]
+            if conflicts:
+                raise RuntimeError(
+                    f'{archive_model.__tablename__} already holds different rows with ids '
+                    f'{conflicts[:10]}; live ids were reused, nothing was deleted'
+                )
+            rows = [row for row in rows if row['id'] not in existing]
+            if rows:
+                conn.execute(db.insert(archive_model), rows)
+
+    def archive_batch(self, model, cutoff, limit):
+        """Archive up to ``limit`` handled rows created before ``cutoff``; returns the count"""
+        archive_model = ARCHIVE_MODELS[model]
+        status = getattr(model, STATUS_COLUMNS[model])
+        rows = db.session.execute(
+            db.select(model.__table__)
+            .where(status == db.true(), model.created_at < cutoff)
+            .order_by(model.created_at, model.id)
+            .limit(limit)
+        ).mappings().all()
+        # End the read transaction before taking any write lock
+        db.session.commit()
+        if not rows:
+            return 0
+
+        filter_columns = [column.key for column in archive_model.__table__.columns if column.key in rows[0]]
+        now = datetime.utcnow()
+        archive_rows = []
+        for row in rows:
+            values = dict(row)
+            archived = {name: values[name] for name in filter_columns}
+            if archive_model is PrayerRequestArchive:
+                archived['purged'] = values['request'] == PURGED_TEXT
+            archived.update(archived_at=now, payload=_encode(values))
+            archive_rows.append(archived)
+        self._insert_archive(archive_model, archive_rows)
+
+        # Only rows still archivable: one reopened or deleted since the select stays as it is
+        ids = [row['id'] for row in rows]
+        deleted = db.session.execute(
+            db.delete(model).where(model.id.in_(ids), status == db.true(), model.created_at < cutoff)
+        ).rowcount
+        if deleted < len(ids):
+            kept = db.session.execute(db.select(model.id).where(model.id.in_(ids))).scalars().all()
+            self._drop_archived(archive_model, kept)
+        else:
+            db.session.commit()
+        return deleted
+
+    def _drop_archived(self, archive_model, ids):
+        """Commit the live delete and remove the archive copies of ``ids``, which stay live"""
+        if not ids:
+            db.session.commit()
+        elif self.engine is db.engine:
+            # Same database: in the delete's transaction
+            db.session.execute(db.delete(archive_model).where(archive_model.id.in_(ids)))
+            db.session.commit()
+        else:
+            db.session.commit()
+            with self.engine.begin() as conn:
+                conn.execute(db.delete(archive_model).where(archive_model.id.in_(ids)))
+
+    def purge_batch(self, cutoff, limit):
+        """Purge the text of up to ``limit`` live anonymous prayer requests created before ``cutoff``"""
+        ids = db.session.execute(
+            db.select(PrayerRequest.id)
+            .where(
+                PrayerRequest.is_anonymous == db.true(),
+                PrayerRequest.created_at < cutoff,
+                PrayerRequest.request != PURGED_TEXT,
+            )
+            .order_by(PrayerRequest.created_at, PrayerRequest.id)
+            .limit(limit)
+        ).scalars().all()
+        if ids:
+            db.session.execute(
+                db.update(PrayerRequest)
+                .where(PrayerRequest.id.in_(ids))
+                .values(request=PURGED_TEXT, admin_notes=None)
+            )
+        db.session.commit()
+        return len(ids)
+
+    def purge_archive_batch(self, cutoff, limit):
+        """Purge up to ``limit`` archived anonymous prayer requests created before ``cutoff``"""
+        with self.session() as session:
+            rows = session.execute(
+                db.select(PrayerRequestArchive.id, PrayerRequestArchive.payload)
+                .where(
+                    PrayerRequestArchive.is_anonymous == db.true(),
+                    PrayerRequestArchive.created_at < cutoff,
+                    PrayerRequestArchive.purged == db.false(),
+                )
+                .order_by(PrayerRequestArchive.created_at, PrayerRequestArchive.id)
+                .limit(limit)
+            ).all()
+            for row_id, payload in rows:
+                session.execute(
+                    db.update(PrayerRequestArchive)
+                    .where(PrayerRequestArchive.id == row_id)
+                    .values(purged=True, payload=_encode(_purge_values(_decode(payload))))
+                )
+            session.commit()
+        return len(rows)
+
+    def _drain(self, step, *args):
+        config = self.app.config
+        total = 0
+        while True:
+            done = step(*args, config['RETENTION_BATCH_SIZE'])
+            total += done
+            if done < config['RETENTION_BATCH_SIZE']:
+                return total
+            time.sleep(config['RETENTION_BATCH_PAUSE'])
+
+    def run(self, now=None):
+        """Apply the policy until nothing is due; returns counts per step"""
+        config = self.app.config
+        now = now or datetime.utcnow()
+        results = {}
+        if config['RETENTION_PURGE_ANONYMOUS_DAYS'] > 0:
+            cutoff = now - timedelta(days=config['RETENTION_PURGE_ANONYMOUS_DAYS'])
+            results['purged'] = self._drain(self.purge_batch, cutoff)
+            results['purged_archived'] = self._drain(self.purge_archive_batch, cutoff)
+        if config['RETENTION_ARCHIVE_DAYS'] > 0:
+            cutoff = now - timedelta(days=config['RETENTION_ARCHIVE_DAYS'])
+            for model in ARCHIVE_MODELS:
+                results[f'archived_{model.__tablename__}'] = self._drain(self.archive_batch, model, cutoff)
+        touched = bool(results)
+        if config['EMAIL_QUEUE_KEEP_DAYS'] > 0:
+            from src.services.email_queue import email_queue
+            cutoff = now - timedelta(days=config['EMAIL_QUEUE_KEEP_DAYS'])
+            results['pruned_emails'] = self._drain(email_queue.prune_batch, cutoff)
+        if touched:
+            from src.services.pagination import count_cache
+            from src.services.response_cache import response_cache
+            for model in ARCHIVE_MODELS:
+                count_cache.invalidate(model)
+                response_cache.invalidate(model)
+        return results
+
+    def archived_chunks(self, model, args, fields, isoformat=False, cursor=None):
+        """Export chunks of archived rows, like ``iter_chunks`` on the live table.
+
+        Accepts the list-endpoint filters except ``q`` (archived text is
+        compressed, not indexed); raises ValueError, on the first ``next()``.
+        """
+        archive_model = ARCHIVE_MODELS[model]
+        if args.get('q', '').strip():
+            raise ValueError('Full-text search (q) is not available for archived rows')
+        columns, serialize = projection(model, fields, isoformat=isoformat)
+        names = [column.key for column in columns]
+        dates = {column.key for column in columns if column.type.python_type is datetime}
+
+        def serialize_archived(row):
+            values = _decode(row.payload)
+            return serialize(tuple(
+                datetime.fromisoformat(values[name]) if name in dates and values.get(name) else values.get(name)
+                for name in names
+            ))
+
+        session = self.session()
+        try:
+            query, _ = apply_filters(session.query(archive_model), archive_model, args)
+            query = query.with_entities(archive_model.created_at, archive_model.id, archive_model.payload)
+            yield from iter_chunks(query, archive_model, serialize_archived, cursor)
+        finally:
+            session.close()
+
+    def archived_buckets(self, model, bucket_expression):
+        """``{bucket: count}`` of archived rows of ``model`` grouped by an expression"""
+        archive_model = ARCHIVE_MODELS[model]
+        bucket = bucket_expression(archive_model)
+        with self.session() as session:
+            return dict(session.execute(db.select(bucket, db.func.count()).group_by(bucket)).all())
+
+
+retention = Retention()
+
+
+if __name__ == '__main__':
+    from src.main import app
+    from src.db_config import prepare_database
+
+    with app.app_context():
+        prepare_database(app, db)
+        results = retention.run()
+    if not results:
+        print('Nothing to do: set RETENTION_ARCHIVE_DAYS, RETENTION_PURGE_ANONYMOUS_DAYS and/or EMAIL_QUEUE_KEEP_DAYS')
+    for step, count in results.items():
+        print(f'{step}: {count}')
@@ -0,0 +1,130 @@
+from datetime import datetime
+from sqlalchemy.exc import OperationalError
+from src.models.user import db
+
+# Columns covered by full-text search for each submission table
+SEARCH_COLUMNS = {
+    'prayer_request': ('request',),
+    'contact_submission': ('subject', 'message'),
+}
+
+# Tables whose FTS5 index exists on the current database
+_fts_tables = set()
+
+TRUE_VALUES = ('1', 'true', 'yes')
+FALSE_VALUES = ('0', 'false', 'no')
+
+
+def ensure_search_indexes(engine):
+    """Create FTS5 tables and sync triggers for the submission tables (SQLite only).
+
+    The FTS tables use external content, so the text is stored once in the
+    source table; triggers keep the index in step with every insert, update
+    and delete. A newly created index is populated from existing rows.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+    with engine.begin() as conn:
+        for table, columns in SEARCH_COLUMNS.items():
+            fts = f'{table}_fts'
+            column_list = ', '.join(columns)
+            new_values = ', '.join(f'new.{c}' for c in columns)
+            old_values = ', '.join(f'old.{c}' for c in columns)
+
+            exists = conn.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+            ).first()
+            try:
+                conn.exec_driver_sql(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+                    f"{column_list}, content='{table}', content_rowid='id', "
+                    f"tokenize='unicode61 remove_diacritics 2')"
+                )
+            except OperationalError:
+                # SQLite built without FTS5; search falls back to LIKE
+                return
+            conn.exec_driver_sql(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+            )
+            conn.exec_driver_sql(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); END"
+            )
+            conn.exec_driver_sql(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column_list} ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); "
+                f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+            )
+            if not exists:
+                conn.exec_driver_sql(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+            _fts_tables.add(table)
+
+
+def _match_expression(text):
+    """Quote every term so user input cannot inject FTS5 query syntax"""
+    terms = ['"' + term.replace('"', '""') + '"' for term in text.split()]
+    return ' '.join(terms)
+
+
+def apply_search(query, model, text):
+    """Restrict ``query`` to rows whose searchable text matches ``text``"""
+    text = (text or '').strip()
+    if not text:
+        return query
+    table = model.__tablename__
+    if table in _fts_tables:
+        matches = db.text(f"SELECT rowid FROM {table}_fts WHERE {table}_fts MATCH :match").bindparams(
+            match=_match_expression(text)
+        )
+        return query.filter(model.id.in_(matches.columns(db.column('rowid', db.Integer))))
+    pattern = f'%{text}%'
+    return query.filter(db.or_(*[getattr(model, column).ilike(pattern) for column in SEARCH_COLUMNS[table]]))
+
+
+def _parse_bool(name, value):
+    value = value.lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValueError(f'{name} must be true or false')
+
+
+def _parse_datetime(name, value):
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError as e:
+        raise ValueError(f'{name} must be an ISO 8601 date or datetime') from e
+
+
+def apply_filters(query, model, args):
+    """Apply the list-endpoint query parameters to ``query``.
+
+    Supports ``is_processed``/``is_responded``, ``category``, ``language``,
+    ``created_after`` (inclusive), ``created_before`` (exclusive) and ``q``
+    full-text search. Returns ``(query, key)`` where ``key`` identifies the
+    filter set for count caching. Raises ValueError for malformed values.
+    """
+    applied = []
+    for name in ('is_processed', 'is_responded'):
+        if name in args and hasattr(model, name):
+            value = _parse_bool(name, args[name])
+            query = query.filter(getattr(model, name) == value)
+            applied.append((name, value))
+    for name in ('category', 'language'):
+        if args.get(name) and hasattr(model, name):
+            query = query.filter(getattr(model, name) == args[name])
+            applied.append((name, args[name]))
+    if args.get('created_after'):
+        value = _parse_datetime('created_after', args['created_after'])
+        query = query.filter(model.created_at >= value)
+        applied.append(('created_after', value))
+    if args.get('created_before'):
+        value = _parse_datetime('created_before', args['created_before'])
+        query = query.filter(model.created_at < value)
+        applied.append(('created_before', value))
+    if args.get('q', '').strip():
+        query = apply_search(query, model, args['q'])
+        applied.append(('q', args['q'].strip()))
+    return query, tuple(applied) or None
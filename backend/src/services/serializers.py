@@ -0,0 +1,97 @@
+from datetime import datetime
+from operator import itemgetter
+from src.models.forms import PrayerRequest, ContactSubmission
+
+# Columns every projection selects: keyset pagination and export cursors
+# need them even when they are not among the requested fields
+KEY_COLUMNS = ('created_at', 'id')
+
+
+def _column(name):
+    return (name,), None
+
+
+def _unless_anonymous(name, replacement):
+    def build(value, is_anonymous):
+        return replacement if is_anonymous else value
+    return (name, 'is_anonymous'), build
+
+
+# Output fields of list and export rows, in ``to_dict()`` order. Each maps to
+# the columns it reads and how to combine them (None: the column as is).
+FIELDS = {
+    PrayerRequest: {
+        'id': _column('id'),
+        'name': _unless_anonymous('name', 'Anonymous'),
+        'email': _unless_anonymous('email', None),
+        'request': _column('request'),
+        'category': _column('category'),
+        'is_anonymous': _column('is_anonymous'),
+        'language': _column('language'),
+        'created_at': _column('created_at'),
+        'is_processed': _column('is_processed'),
+        'admin_notes': _column('admin_notes'),
+    },
+    ContactSubmission: {
+        'id': _column('id'),
+        'name': _column('name'),
+        'email': _column('email'),
+        'subject': _column('subject'),
+        'message': _column('message'),
+        'language': _column('language'),
+        'created_at': _column('created_at'),
+        'is_responded': _column('is_responded'),
+        'admin_notes': _column('admin_notes'),
+    },
+}
+
+
+def parse_fields(model, value):
+    """Fields named by a ``fields=a,b`` parameter; all of them when empty.
+
+    ``id`` is always included. Raises ValueError on unknown names.
+    """
+    available = FIELDS[model]
+    if not value or not value.strip():
+        return list(available)
+    requested = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = requested - set(available)
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(sorted(unknown))}; expected any of: {', '.join(available)}"
+        )
+    requested.add('id')
+    return [name for name in available if name in requested]
+
+
+def projection(model, fields, isoformat=False):
+    """Columns to select for ``fields`` and a function turning a result row into a dict.
+
+    Rows come straight from the SELECT tuples, so no ORM objects are built.
+    Datetimes stay datetime objects for the JSON provider to encode, or
+    become ISO strings with ``isoformat=True`` (for CSV).
+    """
+    spec = FIELDS[model]
+    names = list(KEY_COLUMNS)
+    for field in fields:
+        for name in spec[field][0]:
+            if name not in names:
+                names.append(name)
+    columns = [getattr(model, name) for name in names]
+    dates = {name for name, column in zip(names, columns) if column.type.python_type is datetime}
+
+    getters = []
+    for field in fields:
+        column_names, build = spec[field]
+        indexes = [names.index(name) for name in column_names]
+        if build is None and not (isoformat and column_names[0] in dates):
+            getters.append((field, itemgetter(indexes[0])))
+        elif build is None:
+            getters.append((field, lambda row, i=indexes[0]: row[i].isoformat() if row[i] else None))
+        else:
+            getters.append((field, lambda row, b=build, idx=indexes: b(*[row[i] for i in idx])))
+
+    def serialize(row):
+        return {field: get(row) for field, get in getters}
+
+    return columns, serialize
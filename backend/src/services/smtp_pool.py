@@ -0,0 +1,168 @@
+import os
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from flask import current_app
+from flask_mail import BadHeaderError, email_dispatched, sanitize_address, sanitize_addresses
+
+# Errors that mean the server dropped (or is about to drop) the session
+DISCONNECT_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+class PooledConnection:
+    """An authenticated SMTP session that can send many messages"""
+
+    def __init__(self, state, pool=None, timeout=None):
+        self.state = state
+        self.pool = pool
+        # Socket timeout for connect and every command; None blocks forever
+        self.timeout = timeout
+        self.host = None
+        self.created_at = self.last_used = time.monotonic()
+        self.num_emails = 0
+
+    def open(self):
+        state = self.state
+        if state.use_ssl:
+            host = smtplib.SMTP_SSL(state.server, state.port, timeout=self.timeout)
+        else:
+            host = smtplib.SMTP(state.server, state.port, timeout=self.timeout)
+
+        host.set_debuglevel(int(state.debug))
+
+        if state.use_tls:
+            host.starttls()
+
+        if state.username and state.password:
+            host.login(state.username, state.password)
+
+        self.host = host
+        self.created_at = self.last_used = time.monotonic()
+        self.num_emails = 0
+        if self.pool is not None:
+            self.pool.connections_opened += 1
+
+    def close(self):
+        if self.host is not None:
+            try:
+                self.host.quit()
+            except (smtplib.SMTPException, OSError):
+                self.host.close()
+        self.host = None
+
+    def send(self, message, envelope_from=None):
+        """Send a flask_mail.Message, reconnecting once if the session was dropped"""
+        assert message.send_to, "No recipients have been added"
+        assert message.sender, (
+            "The message does not specify a sender and a default sender "
+            "has not been configured"
+        )
+
+        if message.has_bad_headers():
+            raise BadHeaderError
+
+        if message.date is None:
+            message.date = time.time()
+
+        if not self.state.suppress:
+            args = (
+                sanitize_address(envelope_from or message.sender),
+                list(sanitize_addresses(message.send_to)),
+                message.as_bytes(),
+                message.mail_options,
+                message.rcpt_options,
+            )
+            if self.host is None:
+                self.open()
+            try:
+                self.host.sendmail(*args)
+            except (DISCONNECT_ERRORS + (smtplib.SMTPResponseException,)) as e:
+                # 421 is the server announcing it is closing the channel
+                if isinstance(e, smtplib.SMTPResponseException) and e.smtp_code != 421:
+                    raise
+                self.close()
+                self.open()
+                self.host.sendmail(*args)
+            self.num_emails += 1
+            self.last_used = time.monotonic()
+
+        app = current_app._get_current_object()
+        email_dispatched.send(app, message=message)
+
+
+class SMTPConnectionPool:
+    """Keeps authenticated SMTP sessions alive and hands them out for reuse.
+
+    Flask-Mail opens a new TCP+TLS+AUTH session per ``mail.send``; this pool
+    reuses idle sessions instead and recycles them after
+    ``MAIL_POOL_IDLE_TIMEOUT`` seconds idle or ``MAIL_POOL_MAX_MESSAGES`` sends.
+    """
+
+    def __init__(self, app=None):
+        self._idle = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.connections_opened = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('MAIL_POOL_SIZE', int(os.getenv('MAIL_POOL_SIZE', 4)))
+        app.config.setdefault('MAIL_POOL_IDLE_TIMEOUT', float(os.getenv('MAIL_POOL_IDLE_TIMEOUT', 60)))
+        app.config.setdefault('MAIL_POOL_MAX_MESSAGES', int(os.getenv('MAIL_POOL_MAX_MESSAGES', 100)))
+        app.config.setdefault('MAIL_TIMEOUT', float(os.getenv('MAIL_TIMEOUT', 20)))
+        app.extensions['smtp_pool'] = self
+
+    def _checkout(self, state, config):
+        with self._lock:
+            if self._pid != os.getpid():
+                # Sockets inherited across fork belong to the parent; drop them
+                self._idle = []
+                self._pid = os.getpid()
+            while self._idle:
+                conn = self._idle.pop()
+                if conn.state is state and time.monotonic() - conn.last_used < config['MAIL_POOL_IDLE_TIMEOUT']:
+                    return conn
+                conn.close()
+
+        conn = PooledConnection(state, self, timeout=config['MAIL_TIMEOUT'])
+        if not state.suppress:
+            conn.open()
+        return conn
+
+    def _checkin(self, conn, config):
+        if conn.host is None and not conn.state.suppress:
+            return
+        if conn.num_emails >= config['MAIL_POOL_MAX_MESSAGES']:
+            conn.close()
+            return
+        with self._lock:
+            if len(self._idle) < config['MAIL_POOL_SIZE']:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection for one or more sends"""
+        config = current_app.config
+        state = current_app.extensions['mail']
+        conn = self._checkout(state, config)
+        try:
+            yield conn
+        except DISCONNECT_ERRORS:
+            conn.close()
+            raise
+        finally:
+            self._checkin(conn, config)
+
+    def close_all(self):
+        """Close every idle connection"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+smtp_pool = SMTPConnectionPool()
@@ -0,0 +1,188 @@
+import gzip
+import mimetypes
+import os
+import re
+from flask import current_app, request, send_file
+
+try:
+    import brotli
+except ImportError:  # optional; only gzip variants are generated without it
+    brotli = None
+
+# Content-Encoding -> file suffix, in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+VARIANT_SUFFIXES = tuple(suffix for _, suffix in ENCODINGS)
+
+# Vite emits content-hashed names such as assets/index-4f3a9c1e.js
+HASHED_NAME_RE = re.compile(r'[.-][A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$')
+
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml', 'application/xml')
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+
+class StaticFile:
+    """One file of the static folder and its precompressed siblings"""
+
+    def __init__(self, folder, relative_path):
+        self.path = os.path.join(folder, relative_path)
+        stat = os.stat(self.path)
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        self.etag = f'{int(stat.st_mtime):x}-{stat.st_size:x}'
+        self.mimetype = mimetypes.guess_type(relative_path)[0] or 'application/octet-stream'
+        name = relative_path.rsplit('/', 1)[-1]
+        self.immutable = relative_path.startswith('assets/') and bool(HASHED_NAME_RE.search(name))
+        self.variants = {
+            encoding: self.path + suffix
+            for encoding, suffix in ENCODINGS
+            if os.path.isfile(self.path + suffix)
+        }
+
+
+class StaticIndex:
+    """Files of one static folder keyed by their URL path"""
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.files = {}
+        self.index_html = None
+        self.build()
+
+    def build(self):
+        files = {}
+        if self.folder and os.path.isdir(self.folder):
+            for root, _, names in os.walk(self.folder):
+                for name in names:
+                    if name.endswith(VARIANT_SUFFIXES):
+                        continue
+                    relative_path = os.path.relpath(os.path.join(root, name), self.folder).replace(os.sep, '/')
+                    files[relative_path] = StaticFile(self.folder, relative_path)
+        self.files = files
+        self.index_html = self._load_index_html(files.get('index.html'))
+
+    @staticmethod
+    def _load_index_html(entry):
+        if entry is None:
+            return None
+        with open(entry.path, 'rb') as f:
+            body = f.read()
+        bodies = {None: body, 'gzip': gzip.compress(body, mtime=0)}
+        if brotli is not None:
+            bodies['br'] = brotli.compress(body)
+        return entry.etag, bodies
+
+
+class StaticFiles:
+    """Serves the built frontend from an index of ``static/`` built at startup.
+
+    Lookups are a dict access instead of filesystem checks per request.
+    ``.br``/``.gz`` siblings are sent to clients that accept them, hashed
+    Vite assets get a one-year immutable Cache-Control and everything else
+    revalidates with its ETag. Unknown paths get the SPA ``index.html``,
+    kept in memory (with compressed copies) along with its ETag.
+
+    The index is rebuilt on every request in debug mode so a running dev
+    server picks up new builds; otherwise restart after deploying assets.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['static_files'] = StaticIndex(app.static_folder)
+        app.add_url_rule('/', 'serve', self.serve, defaults={'path': ''})
+        app.add_url_rule('/<path:path>', 'serve', self.serve)
+
+    @staticmethod
+    def _encoding(available):
+        accepted = request.accept_encodings
+        for encoding, _ in ENCODINGS:
+            if encoding in available and accepted[encoding] > 0:
+                return encoding
+        return None
+
+    def serve(self, path):
+        index = current_app.extensions['static_files']
+        if current_app.debug:
+            index.build()
+        entry = index.files.get(path) if path else None
+        if entry is not None:
+            return self._send(entry)
+        if index.index_html is None:
+            if index.folder is None:
+                return "Static folder not configured", 404
+            return "index.html not found", 404
+        return self._send_index(*index.index_html)
+
+    def _send(self, entry):
+        encoding = self._encoding(entry.variants)
+        response = send_file(
+            entry.variants[encoding] if encoding else entry.path,
+            mimetype=entry.mimetype,
+            etag=f'{entry.etag}-{encoding}' if encoding else entry.etag,
+            conditional=True,
+            last_modified=entry.mtime,
+            max_age=None
+        )
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if entry.variants:
+            response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = IMMUTABLE if entry.immutable else REVALIDATE
+        return response
+
+    def _send_index(self, etag, bodies):
+        encoding = self._encoding(bodies)
+        response = current_app.response_class(bodies[encoding], mimetype='text/html')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        response.set_etag(f'{etag}-{encoding}' if encoding else etag)
+        response.headers['Cache-Control'] = REVALIDATE
+        return response.make_conditional(request)
+
+
+def precompress(folder, min_size=1024):
+    """Write ``.gz`` (and ``.br`` with brotli installed) next to compressible files.
+
+    Run after ``npm run build`` copies the frontend into ``static/``.
+    Returns the number of files written; up-to-date variants are skipped.
+    """
+    written = 0
+    for root, _, names in os.walk(folder):
+        for name in names:
+            if name.endswith(VARIANT_SUFFIXES):
+                continue
+            path = os.path.join(root, name)
+            mimetype = mimetypes.guess_type(name)[0] or ''
+            if os.path.getsize(path) < min_size or not mimetype.startswith(COMPRESSIBLE_TYPES):
+                continue
+            with open(path, 'rb') as f:
+                body = f.read()
+            compressors = [('.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+            if brotli is not None:
+                compressors.append(('.br', lambda data: brotli.compress(data, quality=11)))
+            for suffix, compress in compressors:
+                target = path + suffix
+                if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+                    continue
+                with open(target, 'wb') as f:
+                    f.write(compress(body))
+                written += 1
+    return written
+
+
+static_files = StaticFiles()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Precompress the static folder')
+    parser.add_argument('folder', nargs='?', default=os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static'))
+    parser.add_argument('--min-size', type=int, default=1024)
+    args = parser.parse_args()
+    print(f'{precompress(args.folder, args.min_size)} file(s) written')
@@ -0,0 +1,163 @@
+from collections import Counter
+from src.models.user import db
+from src.models.forms import PrayerRequest, ContactSubmission, SubmissionCount
+
+# Dimensions counted for each submission table; the last one is its status flag
+DIMENSIONS = {
+    PrayerRequest: ('category', 'language', 'day', 'is_processed'),
+    ContactSubmission: ('language', 'day', 'is_responded'),
+}
+
+STATS_KEYS = {
+    PrayerRequest: 'prayer_requests',
+    ContactSubmission: 'contact_submissions',
+}
+
+
+def _bucket(dimension, value):
+    if dimension == 'day':
+        return value.date().isoformat() if value is not None else ''
+    if dimension.startswith('is_'):
+        return 'true' if value else 'false'
+    return value or ''
+
+
+def _bucket_expression(model, dimension):
+    """SQL equivalent of _bucket for rebuilding from the source table"""
+    if dimension == 'day':
+        # Both SQLite's stored text and PostgreSQL's text cast start with YYYY-MM-DD
+        return db.func.coalesce(db.func.substr(db.cast(model.created_at, db.String), 1, 10), '')
+    column = getattr(model, dimension)
+    if dimension.startswith('is_'):
+        return db.case((column == db.true(), 'true'), else_='false')
+    return db.func.coalesce(column, '')
+
+
+def _apply(deltas):
+    """Add ``deltas`` ({(table, dimension, bucket): n}) to the counters in the current transaction"""
+    rows = [
+        {'table': table, 'dimension': dimension, 'bucket': bucket, 'count': n}
+        for (table, dimension, bucket), n in deltas.items()
+        if n
+    ]
+    if not rows:
+        return
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        statement = insert(SubmissionCount)
+        statement = statement.on_conflict_do_update(
+            index_elements=['table', 'dimension', 'bucket'],
+            set_={'count': SubmissionCount.count + statement.excluded['count']}
+        )
+        db.session.execute(statement, rows)
+        return
+    for row in rows:
+        updated = db.session.execute(
+            db.update(SubmissionCount)
+            .where(
+                SubmissionCount.table == row['table'],
+                SubmissionCount.dimension == row['dimension'],
+                SubmissionCount.bucket == row['bucket'],
+            )
+            .values(count=SubmissionCount.count + row['count'])
+        ).rowcount
+        if not updated:
+            db.session.execute(db.insert(SubmissionCount), row)
+
+
+def record_inserts(model, rows):
+    """Count new rows of ``model`` given their column values (mappings).
+
+    Call in the transaction that inserts them, after defaults are applied.
+    """
+    table = model.__tablename__
+    deltas = Counter()
+    for row in rows:
+        for dimension in DIMENSIONS[model]:
+            value = row['created_at'] if dimension == 'day' else row[dimension]
+            deltas[(table, dimension, _bucket(dimension, value))] += 1
+    _apply(deltas)
+
+
+def record_status_change(model, value, changed):
+    """Move ``changed`` rows of ``model`` into the ``value`` status bucket"""
+    if not changed:
+        return
+    table, status = model.__tablename__, DIMENSIONS[model][-1]
+    _apply({
+        (table, status, _bucket(status, value)): changed,
+        (table, status, _bucket(status, not value)): -changed,
+    })
+
+
+def read_stats():
+    """All counters as ``{stats key: {dimension: {bucket: count}, 'total': n}}``.
+
+    One scan of the counter table: O(buckets), independent of row counts.
+    """
+    stats = {
+        key: {'total': 0, **{dimension: {} for dimension in DIMENSIONS[model]}}
+        for model, key in STATS_KEYS.items()
+    }
+    tables = {model.__tablename__: (model, key) for model, key in STATS_KEYS.items()}
+    for table, dimension, bucket, count in db.session.execute(
+        db.select(SubmissionCount.table, SubmissionCount.dimension, SubmissionCount.bucket, SubmissionCount.count)
+    ):
+        if table not in tables or not count:
+            continue
+        model, key = tables[table]
+        stats[key].setdefault(dimension, {})[bucket] = count
+        if dimension == DIMENSIONS[model][-1]:
+            stats[key]['total'] += count
+    for dimension_counts in stats.values():
+        if 'day' in dimension_counts:
+            dimension_counts['day'] = dict(sorted(dimension_counts['day'].items()))
+    return stats
+
+
+def rebuild_counts():
+    """Recompute every counter from the source tables (caller commits).
+
+    Runs as one DELETE plus one INSERT ... SELECT ... GROUP BY per
+    dimension, so on SQLite the rebuild sees no concurrent inserts. On
+    other databases run it when submissions are quiet, or rerun it.
+    Archived rows (see src.services.retention) are added on top, so the
+    counters keep covering every submission ever received.
+    """
+    from src.services.retention import retention
+
+    # Read the archive before taking the write lock on the counter table
+    archived = Counter()
+    for model, dimensions in DIMENSIONS.items():
+        for dimension in dimensions:
+            buckets = retention.archived_buckets(model, lambda m, d=dimension: _bucket_expression(m, d))
+            for bucket, n in buckets.items():
+                archived[(model.__tablename__, dimension, bucket)] += n
+
+    db.session.execute(db.delete(SubmissionCount))
+    for model, dimensions in DIMENSIONS.items():
+        for dimension in dimensions:
+            bucket = _bucket_expression(model, dimension)
+            db.session.execute(db.insert(SubmissionCount).from_select(
+                ['table', 'dimension', 'bucket', 'count'],
+                db.select(
+                    db.literal(model.__tablename__), db.literal(dimension), bucket, db.func.count()
+                ).group_by(bucket)
+            ))
+    _apply(archived)
+    return db.session.query(SubmissionCount).count()
+
+
+if __name__ == '__main__':
+    from src.main import app
+    from src.db_config import prepare_database
+
+    with app.app_context():
+        prepare_database(app, db)
+        buckets = rebuild_counts()
+        db.session.commit()
+    print(f'Rebuilt {buckets} counter bucket(s)')
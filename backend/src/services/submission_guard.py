@@ -0,0 +1,265 @@
+import hashlib
+import os
+import threading
+import time
+from flask import request
+
+# Largest number of buckets the in-memory store keeps before pruning idle ones
+MEMORY_STORE_MAX_KEYS = 10000
+
+PENDING = 'pending'
+
+
+class MemoryStore:
+    """Token buckets and dedup markers for a single process"""
+
+    errors = ()
+
+    def __init__(self):
+        self._buckets = {}
+        self._markers = {}
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate, cost=1):
+        """Take ``cost`` tokens; returns seconds until they are available, or 0"""
+        now = time.monotonic()
+        with self._lock:
+            if len(self._buckets) > MEMORY_STORE_MAX_KEYS:
+                self._prune(now, capacity, rate)
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens < cost:
+                self._buckets[key] = (tokens, now)
+                return (cost - tokens) / rate
+            self._buckets[key] = (tokens - cost, now)
+            return 0
+
+    def _prune(self, now, capacity, rate):
+        # A bucket idle long enough to have refilled is the same as no bucket
+        full_after = capacity / rate
+        for key in [k for k, (_, updated) in self._buckets.items() if now - updated >= full_after]:
+            del self._buckets[key]
+        for key in [k for k, (expires, _) in self._markers.items() if expires <= now]:
+            del self._markers[key]
+
+    def add(self, key, value, ttl):
+        """Set ``key`` unless it exists; returns True when set"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._markers.get(key)
+            if entry and entry[0] > now:
+                return False
+            self._markers[key] = (now + ttl, value)
+            return True
+
+    def get(self, key):
+        with self._lock:
+            entry = self._markers.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._markers[key] = (time.monotonic() + ttl, value)
+
+    def delete(self, key):
+        with self._lock:
+            self._markers.pop(key, None)
+
+
+# Refill and take in one round trip so concurrent workers cannot overdraw
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens < cost then
+    wait = (cost - tokens) / rate
+else
+    tokens = tokens - cost
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisStore:
+    """Token buckets and dedup markers shared by every worker process"""
+
+    PREFIX = 'chatat:guard:'
+
+    def __init__(self, url):
+        # Optional dependency, only needed when RATE_LIMIT_STORAGE_URL is set
+        import redis
+        self.errors = (redis.RedisError,)
+        self.client = redis.Redis.from_url(url)
+        self._take = self.client.register_script(_TAKE_SCRIPT)
+
+    def take(self, key, capacity, rate, cost=1):
+        return float(self._take(keys=[self.PREFIX + key], args=[capacity, rate, time.time(), cost]))
+
+    def add(self, key, value, ttl):
+        return bool(self.client.set(self.PREFIX + key, value, nx=True, ex=max(1, int(ttl))))
+
+    def get(self, key):
+        value = self.client.get(self.PREFIX + key)
+        return value.decode('utf-8') if value is not None else None
+
+    def set(self, key, value, ttl):
+        self.client.set(self.PREFIX + key, value, ex=max(1, int(ttl)))
+
+    def delete(self, key):
+        self.client.delete(self.PREFIX + key)
+
+
+class SubmissionGuard:
+    """Rate limiting and duplicate suppression for the public form endpoints.
+
+    Each client IP and each submitter email gets a token bucket holding up
+    to ``RATE_LIMIT_BURST`` submissions that refills at
+    ``RATE_LIMIT_PER_MINUTE``. Batch submissions also draw one token per
+    item from a per-IP ``batch`` bucket of ``RATE_LIMIT_BATCH_BURST`` items
+    refilling at ``RATE_LIMIT_BATCH_PER_MINUTE``. A submission whose cleaned
+    content matches one accepted in the last ``DEDUP_WINDOW`` seconds
+    returns the original id instead of inserting again and re-sending its
+    emails.
+
+    State is per process by default; set ``RATE_LIMIT_STORAGE_URL`` to a
+    Redis URL to share it between workers (needs ``redis``). If that store
+    is unreachable, requests are let through rather than rejected.
+    """
+
+    def __init__(self, app=None):
+        self.store = None
+        self.app = None
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(
+            ('allowed', 'rate_limited_ip', 'rate_limited_email', 'rate_limited_batch',
+             'deduplicated', 'duplicate_conflicts', 'errors'), 0
+        )
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('RATE_LIMIT_ENABLED', os.getenv('RATE_LIMIT_ENABLED', 'True').lower() == 'true')
+        app.config.setdefault('RATE_LIMIT_PER_MINUTE', float(os.getenv('RATE_LIMIT_PER_MINUTE', 10)))
+        app.config.setdefault('RATE_LIMIT_BURST', int(os.getenv('RATE_LIMIT_BURST', 5)))
+        app.config.setdefault('RATE_LIMIT_BATCH_BURST', int(os.getenv('RATE_LIMIT_BATCH_BURST', 100)))
+        app.config.setdefault('RATE_LIMIT_BATCH_PER_MINUTE', float(os.getenv('RATE_LIMIT_BATCH_PER_MINUTE', 10)))
+        app.config.setdefault('RATE_LIMIT_TRUSTED_PROXIES', int(os.getenv('RATE_LIMIT_TRUSTED_PROXIES', 0)))
+        app.config.setdefault('RATE_LIMIT_STORAGE_URL', os.getenv('RATE_LIMIT_STORAGE_URL'))
+        app.config.setdefault('DEDUP_WINDOW', float(os.getenv('DEDUP_WINDOW', 300)))
+        app.config.setdefault('DEDUP_WAIT', float(os.getenv('DEDUP_WAIT', 2)))
+        if app.config['RATE_LIMIT_STORAGE_URL']:
+            self.store = RedisStore(app.config['RATE_LIMIT_STORAGE_URL'])
+        else:
+            self.store = MemoryStore()
+        self.app = app
+        app.extensions['submission_guard'] = self
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def client_ip(self):
+        """Client address, taken from X-Forwarded-For behind trusted proxies"""
+        proxies = self.app.config['RATE_LIMIT_TRUSTED_PROXIES']
+        forwarded = request.headers.get('X-Forwarded-For')
+        if proxies and forwarded:
+            hops = [hop.strip() for hop in forwarded.split(',')]
+            return hops[max(0, len(hops) - proxies)]
+        return request.remote_addr or 'unknown'
+
+    def limits(self, scope):
+        """(burst, tokens per minute) of a bucket scope"""
+        config = self.app.config
+        if scope == 'batch':
+            return config['RATE_LIMIT_BATCH_BURST'], config['RATE_LIMIT_BATCH_PER_MINUTE']
+        return config['RATE_LIMIT_BURST'], config['RATE_LIMIT_PER_MINUTE']
+
+    def check(self, scope, identity, cost=1):
+        """Take ``cost`` tokens for ``identity``; returns seconds to wait when limited, else 0"""
+        if not self.app.config['RATE_LIMIT_ENABLED'] or not identity:
+            return 0
+        burst, per_minute = self.limits(scope)
+        try:
+            wait = self.store.take(f'{scope}:{identity.lower()}', burst, per_minute / 60, cost)
+        except self.store.errors:
+            self._count('errors')
+            return 0
+        self._count(f'rate_limited_{scope}' if wait else 'allowed')
+        return wait
+
+    @staticmethod
+    def fingerprint(submission):
+        """Hash of an unsaved submission's content; identical forms hash alike"""
+        values = sorted(
+            (column.key, getattr(submission, column.key))
+            for column in submission.__table__.columns
+            if not column.primary_key
+        )
+        return hashlib.sha256(repr((submission.__tablename__, values)).encode('utf-8')).hexdigest()
+
+    def claim(self, submission):
+        """Reserve ``submission``'s content for this request.
+
+        Returns ``(key, existing)``: ``existing`` is None when the content is
+        new (pass ``key`` to ``remember``/``release``), the id of an accepted
+        identical submission, or ``PENDING`` when an identical request is
+        still being saved after waiting ``DEDUP_WAIT`` seconds.
+        """
+        config = self.app.config
+        if not config['DEDUP_WINDOW']:
+            return None, None
+        key = f'dedup:{self.fingerprint(submission)}'
+        deadline = time.monotonic() + config['DEDUP_WAIT']
+        try:
+            while not self.store.add(key, PENDING, config['DEDUP_WINDOW']):
+                existing = self.store.get(key)
+                if existing is not None and existing != PENDING:
+                    self._count('deduplicated')
+                    return None, int(existing)
+                if time.monotonic() >= deadline:
+                    self._count('duplicate_conflicts')
+                    return None, PENDING
+                # The first click is still being saved; wait for its id
+                time.sleep(0.05)
+        except self.store.errors:
+            self._count('errors')
+            return None, None
+        return key, None
+
+    def remember(self, key, submission_id):
+        """Record the id an accepted submission was saved under"""
+        if key is None:
+            return
+        try:
+            self.store.set(key, str(submission_id), self.app.config['DEDUP_WINDOW'])
+        except self.store.errors:
+            self._count('errors')
+
+    def release(self, key):
+        """Drop a reservation whose submission was not saved"""
+        if key is None:
+            return
+        try:
+            self.store.delete(key)
+        except self.store.errors:
+            self._count('errors')
+
+    def stats(self):
+        """Allowed, rejected and deduplicated counters for this process"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['store'] = 'redis' if isinstance(self.store, RedisStore) else 'memory'
+        return stats
+
+
+submission_guard = SubmissionGuard()
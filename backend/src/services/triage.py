@@ -0,0 +1,94 @@
+from src.models.user import db
+from src.models.forms import PrayerRequest, ContactSubmission
+from src.services.search import apply_filters
+from src.services.stats import record_status_change
+from src.services.validation import MAX_TEXT_LENGTH, sanitize_input
+
+# The boolean each admin queue is worked down by
+STATUS_COLUMNS = {
+    PrayerRequest: 'is_processed',
+    ContactSubmission: 'is_responded',
+}
+
+# Upper bound on explicit ids in one bulk update
+MAX_TRIAGE_IDS = 500
+
+
+def _filter_args(filters):
+    """JSON filter values as the query-string strings apply_filters expects"""
+    return {
+        name: ('true' if value else 'false') if isinstance(value, bool) else str(value)
+        for name, value in filters.items()
+        if value is not None
+    }
+
+
+def select_rows(model, data):
+    """Query for the rows named by ``ids`` or matched by ``filter``.
+
+    Exactly one of the two must be given; a filter must restrict something,
+    so an empty body cannot update the whole table. Raises ValueError.
+    """
+    ids, filters = data.get('ids'), data.get('filter')
+    if (ids is None) == (filters is None):
+        raise ValueError('Provide either ids or filter')
+    if ids is not None:
+        if not isinstance(ids, list) or not ids or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+            raise ValueError('ids must be a non-empty array of integers')
+        if len(ids) > MAX_TRIAGE_IDS:
+            raise ValueError(f'At most {MAX_TRIAGE_IDS} ids per request; use a filter for more')
+        return model.query.filter(model.id.in_(set(ids)))
+    if not isinstance(filters, dict):
+        raise ValueError('filter must be an object')
+    query, key = apply_filters(model.query, model, _filter_args(filters))
+    if key is None:
+        raise ValueError('filter must include at least one condition')
+    return query
+
+
+def update_values(model, data):
+    """Column values to SET from the payload; raises ValueError.
+
+    ``admin_notes`` replaces the notes (null clears them); with
+    ``append_notes`` it is added on a new line after any existing notes.
+    """
+    status = STATUS_COLUMNS[model]
+    values = {}
+    if status in data:
+        if not isinstance(data[status], bool):
+            raise ValueError(f'{status} must be true or false')
+        values[status] = data[status]
+    if 'admin_notes' in data:
+        notes = data['admin_notes']
+        if notes is not None and not isinstance(notes, str):
+            raise ValueError('admin_notes must be a string or null')
+        notes = sanitize_input(notes, MAX_TEXT_LENGTH) if notes else None
+        if data.get('append_notes') and notes:
+            existing = db.func.coalesce(model.admin_notes + '\n', '')
+            values['admin_notes'] = existing + notes
+        else:
+            values['admin_notes'] = notes
+    if not values:
+        raise ValueError(f'Nothing to update; set {status} and/or admin_notes')
+    return values
+
+
+def bulk_update(model, query, values):
+    """Apply ``values`` to every row of ``query`` with set-based UPDATEs.
+
+    No ORM objects are loaded; the session is not synchronized, so callers
+    should not hold instances of the affected rows. A status change runs
+    first and only touches rows whose status differs, so its row count is
+    the exact delta for the status counters. Returns the rows changed.
+    """
+    values = dict(values)
+    status = STATUS_COLUMNS[model]
+    changed = 0
+    if status in values:
+        value = values.pop(status)
+        column = getattr(model, status)
+        changed = query.filter(column.is_not(value)).update({status: value}, synchronize_session=False)
+        record_status_change(model, value, changed)
+    if values:
+        changed = query.update(values, synchronize_session=False)
+    return changed
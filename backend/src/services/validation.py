@@ -0,0 +1,112 @@
+import re
+
+# Patterns are compiled once at import rather than looked up in the re
+# module's cache on every call
+EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+TAG_RE = re.compile(r'<[^>]*>')
+
+MAX_TEXT_LENGTH = 5000
+# Longest address SMTP allows (RFC 5321)
+MAX_EMAIL_LENGTH = 254
+
+INVALID_TYPES = 'Invalid field types'
+INVALID_EMAIL = 'Invalid email format'
+
+
+def validate_email(email):
+    """Validate email format"""
+    return len(email) <= MAX_EMAIL_LENGTH and EMAIL_RE.fullmatch(email) is not None
+
+
+def sanitize_input(text, max_length=MAX_TEXT_LENGTH):
+    """Truncate to ``max_length``, then remove HTML/script tags.
+
+    Truncating first bounds the work on oversized input. Tag matches can only
+    start before the last ``>``, so only that prefix is scanned; this keeps
+    runs of unclosed ``<`` linear instead of quadratic.
+    """
+    if not text:
+        return ""
+    text = str(text)
+    if len(text) > max_length:
+        text = text[:max_length]
+        # Drop a tag cut open by the truncation
+        start = text.rfind('<')
+        if start > text.rfind('>'):
+            text = text[:start]
+    end = text.rfind('>') + 1
+    if end:
+        text = TAG_RE.sub('', text[:end]) + text[end:]
+    return text
+
+
+class Field:
+    """Rules for one string field of a submission payload.
+
+    ``required`` is the error message returned when the field is missing or
+    blank. ``unless`` names a payload flag that, when truthy, skips the field
+    and stores None (e.g. name and email of anonymous prayer requests).
+    """
+
+    def __init__(self, name, required=None, max_length=MAX_TEXT_LENGTH, default='',
+                 email=False, sanitize=True, unless=None):
+        self.name = name
+        self.required = required
+        self.max_length = max_length
+        self.default = default
+        self.email = email
+        self.sanitize = sanitize
+        self.unless = unless
+
+    def clean(self, data):
+        """Returns ``(value, None)`` or ``(None, error)``"""
+        if self.unless and data.get(self.unless):
+            return None, None
+        value = data.get(self.name)
+        if value is None:
+            value = self.default
+        if not isinstance(value, str):
+            return None, INVALID_TYPES
+        if self.email:
+            value = value[:MAX_EMAIL_LENGTH + 1].strip()
+        else:
+            value = value[:self.max_length].strip()
+        if not value and self.required:
+            return None, self.required
+        if self.email:
+            if value and not validate_email(value):
+                return None, INVALID_EMAIL
+        elif self.sanitize:
+            value = sanitize_input(value, self.max_length)
+        return value, None
+
+
+# Field order is the order errors are reported in
+PRAYER_REQUEST_SCHEMA = (
+    Field('request', required='Prayer request text is required'),
+    Field('name', required='Name is required for non-anonymous requests', max_length=100, unless='isAnonymous'),
+    Field('email', required='Email is required for non-anonymous requests', email=True, unless='isAnonymous'),
+    Field('category', max_length=50, default='general'),
+    Field('language', max_length=10, default='en'),
+)
+
+CONTACT_SCHEMA = (
+    Field('name', required='Name is required', max_length=100),
+    Field('email', required='Email is required', email=True),
+    Field('subject', required='Subject is required', max_length=200),
+    Field('message', required='Message is required'),
+    Field('language', max_length=10, default='en'),
+)
+
+
+def validate(schema, data):
+    """Clean ``data`` against ``schema``; returns ``(values, None)`` or ``(None, error)``"""
+    if not isinstance(data, dict):
+        return None, 'Item must be an object'
+    values = {}
+    for field in schema:
+        value, error = field.clean(data)
+        if error:
+            return None, error
+        values[field.name] = value
+    return values, None